@@ -0,0 +1,116 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from aitechture.core.risk_engine import RiskEngine
+
+INDIA_BOUNDS = ((8.0, 35.0), (68.0, 97.0))
+
+RISK_KEYS = ["Seismic_Risk", "Flood_Risk", "Heatwave_Risk", "Landslide_Risk", "Design_Strength_Index"]
+
+# (sites, seed) samples float32 is compared on. Rank ties differ between
+# samples, so one sample passing says little about another.
+SAMPLES = [(20_000, 0), (20_000, 1), (50_000, 2), (100_000, 0)]
+
+
+def compare(exact, compact, sites, seed):
+
+    # Largest score difference per risk key, and the share of sites whose
+    # top materials, primary hazard or final design differ
+
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(*INDIA_BOUNDS[0], sites)
+    lons = rng.uniform(*INDIA_BOUNDS[1], sites)
+
+    expected = exact.evaluate_many(lats, lons)
+    result = compact.evaluate_many(lats, lons)
+
+    diffs = {key: np.abs(result[key] - expected[key]).max() for key in RISK_KEYS}
+
+    changed = {
+        "top materials": (result["Top_Material_Index"] != expected["Top_Material_Index"]).any(axis=1),
+        "primary hazard": result["Primary_Hazard_Driver"] != expected["Primary_Hazard_Driver"],
+        "final design": np.any([
+            result["Final_Integrated_Design"][part] != expected["Final_Integrated_Design"][part]
+            for part in expected["Final_Integrated_Design"]
+        ], axis=0),
+    }
+
+    return diffs, {name: mask.mean() for name, mask in changed.items()}
+
+
+def warm_start(cache_dir, float32):
+
+    # Per-component bytes and peak RSS of a fresh process that loads an
+    # engine from the (already built) cache, as a serving worker would
+
+    code = (
+        "import json, resource, sys;"
+        f"sys.path.append({str(Path(__file__).resolve().parents[1] / 'src')!r});"
+        "from aitechture.core.risk_engine import RiskEngine;"
+        f"e = RiskEngine(cache_dir={str(cache_dir)!r}, float32={float32});"
+        "print(json.dumps({'usage': e.memory_usage(),"
+        " 'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Compact engine state: memory and float32 agreement")
+    parser.add_argument("--sites", type=int, nargs="+",
+                        help="Compare on these sample sizes (seed 0) instead of the default samples")
+    args = parser.parse_args()
+
+    failures = []
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        exact = RiskEngine(cache_dir=cache_dir)
+        compact = RiskEngine(cache_dir=cache_dir, float32=True)
+
+        # ---- Memory per component ----
+        reports = {float32: warm_start(cache_dir, float32) for float32 in (False, True)}
+
+    usage64, usage32 = reports[False]["usage"], reports[True]["usage"]
+
+    print(f"{'component':<26} {'float64':>10} {'float32':>10}")
+    for component in usage64:
+        print(f"{component:<26} {usage64[component] / 1024:>7.0f} KiB "
+              f"{usage32.get(component, 0) / 1024:>6.0f} KiB")
+    print(f"{'total':<26} {sum(usage64.values()) / 1024:>7.0f} KiB "
+          f"{sum(usage32.values()) / 1024:>6.0f} KiB")
+    print(f"{'peak RSS (warm start)':<26} {reports[False]['rss'] / 1024:>7.0f} MiB "
+          f"{reports[True]['rss'] / 1024:>6.0f} MiB")
+
+    # ---- float32 against float64 ----
+    # float32 narrows coordinates only, and indexes and the seismic field
+    # are built from float64 ones, so every result must be identical
+    samples = [(sites, 0) for sites in args.sites] if args.sites else SAMPLES
+
+    print()
+    print("float32 vs float64:")
+
+    for sites, seed in samples:
+        diffs, changed = compare(exact, compact, sites, seed)
+
+        print(f"  {sites:>7,} sites, seed {seed}: largest score diff {max(diffs.values()):.1e}, "
+              f"top materials / hazard / design differ at {max(changed.values()):.3%} of sites")
+
+        for key, diff in diffs.items():
+            if diff > 0:
+                failures.append(f"{sites} sites, seed {seed}: {key} differs by {diff:.2e}")
+
+        for name, share in changed.items():
+            if share > 0:
+                failures.append(f"{sites} sites, seed {seed}: {name} differs at {share:.3%} of sites")
+
+    if failures:
+        sys.exit("\n".join(failures))
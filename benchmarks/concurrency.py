@@ -0,0 +1,123 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from aitechture.core.risk_engine import RiskEngine
+
+INDIA_BOUNDS = ((8.0, 35.0), (68.0, 97.0))
+
+ARRAY_KEYS = ["Seismic_Risk", "Flood_Risk", "Heatwave_Risk", "Landslide_Risk",
+              "Top_Material_Index", "Top_Material_Score", "Design_Strength_Index"]
+
+
+def same_batch(a, b):
+    # Bit-for-bit equality, design recommendations included
+    return (
+        all(np.array_equal(a[key], b[key]) for key in ARRAY_KEYS)
+        and np.array_equal(a["Primary_Hazard_Driver"], b["Primary_Hazard_Driver"])
+        and all(
+            np.array_equal(a[design][part], b[design][part])
+            for design in ["Hazard_Driven_Design", "Final_Integrated_Design"]
+            for part in a[design]
+        )
+    )
+
+
+def same_single(a, b):
+    return (
+        all(a[key] == b[key] for key in ["Seismic_Risk", "Flood_Risk", "Heatwave_Risk", "Landslide_Risk"])
+        and a["Top_Materials"].equals(b["Top_Materials"])
+        and a["Design_Recommendations"] == b["Design_Recommendations"]
+    )
+
+
+def stress_evaluate(engine, lats, lons, threads, rounds):
+
+    # `threads` threads call evaluate() on the same sites at once, starting
+    # together; every answer is compared with the serial one.
+
+    expected = [engine.evaluate(lat, lon) for lat, lon in zip(lats, lons)]
+    mismatches = []
+    barrier = threading.Barrier(threads)
+
+    def worker(offset):
+        barrier.wait()
+        for _ in range(rounds):
+            for i in range(len(lats)):
+                j = (i + offset) % len(lats)
+                if not same_single(engine.evaluate(lats[j], lons[j]), expected[j]):
+                    mismatches.append(j)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    seconds = time.perf_counter() - started
+
+    return threads * rounds * len(lats) / seconds, mismatches
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Concurrent evaluation stress test")
+    parser.add_argument("--sites", type=int, default=100_000, help="sites in the batch workload")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--chunk-size", type=int, default=2048)
+    args = parser.parse_args()
+
+    engine = RiskEngine()
+
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(*INDIA_BOUNDS[0], args.sites)
+    lons = rng.uniform(*INDIA_BOUNDS[1], args.sites)
+
+    failures = []
+
+    # ---- Batch: evaluate_concurrent() against one evaluate_many() ----
+    started = time.perf_counter()
+    expected = engine.evaluate_many(lats, lons)
+    baseline = args.sites / (time.perf_counter() - started)
+
+    print(f"CPUs: {os.cpu_count()}")
+    print(f"evaluate_many, 1 thread     : {baseline:>10.0f} sites/s")
+
+    for threads in args.threads:
+        started = time.perf_counter()
+        result = engine.evaluate_concurrent(
+            lats, lons, workers=threads, chunk_size=args.chunk_size
+        )
+        rate = args.sites / (time.perf_counter() - started)
+
+        identical = same_batch(result, expected)
+        print(f"evaluate_concurrent, {threads:>2} thr: {rate:>10.0f} sites/s  "
+              f"x{rate / baseline:.2f}  {'identical' if identical else 'MISMATCH'}")
+
+        if not identical:
+            failures.append(f"evaluate_concurrent with {threads} threads differs")
+
+    # ---- Single-site: many threads calling evaluate() at once ----
+    single_lats, single_lons = lats[:200], lons[:200]
+    single_baseline = None
+
+    for threads in args.threads:
+        rate, mismatches = stress_evaluate(engine, single_lats, single_lons, threads, rounds=2)
+        single_baseline = single_baseline or rate
+
+        print(f"evaluate, {threads:>2} threads        : {rate:>10.0f} sites/s  "
+              f"x{rate / single_baseline:.2f}  {len(mismatches)} mismatches")
+
+        if mismatches:
+            failures.append(f"evaluate with {threads} threads differs at {len(mismatches)} sites")
+
+    if failures:
+        sys.exit("\n".join(failures))
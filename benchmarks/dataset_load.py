@@ -0,0 +1,70 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.append(str(SRC))
+
+from aitechture.data_pipeline.columnar import find_bundle
+from aitechture.data_pipeline.data_loader import DATA_DIR
+
+LOADERS = {
+    "compiled_clean.csv": "load_compiled",
+    "earthquake_clean.csv": "load_earthquake",
+    "landslide_clean.csv": "load_landslide",
+}
+
+PATHS = {
+    "CSV": "prefer_columnar=False",
+    "columnar": "",
+    # Coordinates only, as read by the spatial indexes
+    "columnar, lat/lon": "columns=['Latitude', 'Longitude']",
+}
+
+# Each measurement runs in a fresh interpreter so peak RSS (which also
+# covers the CSV parser's C allocations) is not inherited from a previous
+# run. The first call also warms up lazy imports and the page cache.
+CHILD = """
+import json, resource, sys, time
+sys.path.insert(0, {src!r})
+from aitechture.data_pipeline.data_loader import {loader}
+
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+{loader}({kwargs})
+
+timings = []
+for _ in range({repeat}):
+    started = time.perf_counter()
+    df = {loader}({kwargs})
+    timings.append(time.perf_counter() - started)
+    del df
+
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": min(timings), "peak_kib": peak - baseline}}))
+"""
+
+
+def measure(loader, kwargs, repeat=5):
+    code = CHILD.format(src=str(SRC), loader=loader, kwargs=kwargs, repeat=repeat)
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+if __name__ == "__main__":
+
+    missing = [name for name in LOADERS if find_bundle(DATA_DIR / name) is None]
+    if missing:
+        sys.exit(f"No current columnar bundle for {missing}; run `python run.py convert-data`")
+
+    print(f"{'Dataset':<22} {'Path':<18} {'ms':>8} {'peak RSS growth':>16}")
+
+    for name, loader in LOADERS.items():
+        for label, kwargs in PATHS.items():
+            result = measure(loader, kwargs)
+            print(
+                f"{name:<22} {label:<18} {result['seconds'] * 1000:>8.1f} "
+                f"{result['peak_kib'] / 1024:>12.2f} MiB"
+            )
@@ -0,0 +1,92 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# module: (budget in ms, packages it must not import)
+TARGETS = {
+    "run": (50, ["pandas", "sklearn"]),
+    "aitechture.api.app": (400, ["pandas", "sklearn"]),
+    "aitechture.core.risk_engine": (600, ["sklearn"]),
+}
+
+CHILD = """
+import json, sys
+sys.path[:0] = [{root!r}, {src!r}]
+import {module}
+print(json.dumps(sorted({{name.split(".")[0] for name in sys.modules}})))
+"""
+
+
+def import_profile(module):
+
+    # Cumulative import time of `module` in microseconds, the slowest
+    # modules it pulled in, and the top-level packages loaded afterwards.
+
+    code = CHILD.format(root=str(ROOT), src=str(ROOT / "src"), module=module)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True
+    )
+
+    total = None
+    subtree = []
+    slowest = []
+
+    # Children are logged before their parent and indented below it, so
+    # the target's imports are the nested lines just above its own line.
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split("|")
+
+        if name.startswith("  "):
+            subtree.append((int(cumulative), name.strip()))
+            continue
+
+        if name.strip() == module:
+            total = int(cumulative)
+            slowest = sorted(subtree, reverse=True)[:5]
+
+        subtree = []
+
+    loaded = set(json.loads(completed.stdout))
+
+    return total, slowest, loaded
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Import time budget check (python -X importtime)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per module; the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget, for slow machines")
+    args = parser.parse_args()
+
+    failures = []
+
+    for module, (budget_ms, forbidden) in TARGETS.items():
+
+        runs = [import_profile(module) for _ in range(args.repeat)]
+        total, slowest, loaded = min(runs, key=lambda run: run[0])
+
+        total_ms = total / 1000
+        budget_ms *= args.scale
+        leaked = sorted(loaded.intersection(forbidden))
+
+        status = "ok" if total_ms <= budget_ms and not leaked else "FAIL"
+        print(f"{module:<30} {total_ms:>8.1f} ms  (budget {budget_ms:.0f} ms)  {status}")
+
+        for cumulative, name in slowest:
+            print(f"    {cumulative / 1000:>8.1f} ms  {name}")
+
+        if total_ms > budget_ms:
+            failures.append(f"{module} took {total_ms:.1f} ms, budget {budget_ms:.0f} ms")
+        if leaked:
+            failures.append(f"{module} imported {', '.join(leaked)}")
+
+    if failures:
+        sys.exit("\n".join(failures))
@@ -0,0 +1,74 @@
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from aitechture.core.risk_engine import RiskEngine
+from aitechture.data_pipeline.attenuation import KERNELS
+from aitechture.data_pipeline.spatial_aggregation import build_seismic_field
+
+INDIA_BOUNDS = ((8.0, 35.0), (68.0, 97.0))
+
+
+def started(**kwargs):
+    begin = time.perf_counter()
+    engine = RiskEngine(**kwargs)
+    return engine, time.perf_counter() - begin
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Attenuation kernels side by side")
+    parser.add_argument("--kernels", nargs="+", default=sorted(KERNELS))
+    parser.add_argument("--sites", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(*INDIA_BOUNDS[0], args.sites)
+    lons = rng.uniform(*INDIA_BOUNDS[1], args.sites)
+
+    failures = []
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+
+        # Shared artifacts are built once, by the default kernel
+        baseline, seconds = started(cache_dir=cache_dir)
+        reference = baseline.evaluate_many(lats, lons)["Seismic_Risk"]
+
+        print(f"Shared artifacts: {seconds * 1000:.0f} ms (cache {baseline.cache_status})")
+        print()
+        print(f"{'kernel':<12} {'first start':>12} {'warm start':>11} {'mean field':>11} "
+              f"{'score corr':>11}  index == brute force")
+
+        for name in args.kernels:
+            engine, first = started(cache_dir=cache_dir, kernel=name)
+            engine, warm = started(cache_dir=cache_dir, kernel=name)
+
+            scores = engine.evaluate_many(lats, lons)["Seismic_Risk"]
+
+            # Index pruning at the kernel's support drops nothing
+            pruned = build_seismic_field(
+                lats, lons, engine.earthquake_catalogue,
+                index=engine.earthquake_index, kernel=engine.kernel
+            )
+            brute = build_seismic_field(
+                lats, lons, engine.earthquake_catalogue, kernel=engine.kernel
+            )
+            same = np.allclose(pruned, brute, rtol=1e-12, atol=1e-9)
+
+            print(f"{name:<12} {first * 1000:>9.0f} ms {warm * 1000:>8.0f} ms "
+                  f"{engine.seismic_field.mean():>11.1f} "
+                  f"{np.corrcoef(scores, reference)[0, 1]:>11.3f}  {'yes' if same else 'NO'}")
+
+            if not same:
+                failures.append(f"{name}: indexed and brute-force fields differ")
+            if engine.cache_status != "hit":
+                failures.append(f"{name}: second start was a cache {engine.cache_status}")
+
+    if failures:
+        sys.exit("\n".join(failures))
@@ -0,0 +1,79 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from aitechture.core.risk_engine import RiskEngine
+from aitechture.data_pipeline.parallel import build_seismic_field_parallel
+
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def grid(engine, step):
+
+    # Raster-style node grid over the compiled dataset extent
+
+    lats = np.arange(engine.compiled["Latitude"].min(), engine.compiled["Latitude"].max(), step)
+    lons = np.arange(engine.compiled["Longitude"].min(), engine.compiled["Longitude"].max(), step)
+
+    lats, lons = np.meshgrid(lats, lons, indexing="ij")
+    return lats.ravel(), lons.ravel()
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Seismic field build time vs worker count")
+    parser.add_argument("--step", type=float, default=0.05, help="grid step in degrees")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = RiskEngine()
+
+    workloads = {
+        "compiled sites": (
+            engine.compiled["Latitude"].values,
+            engine.compiled["Longitude"].values,
+        ),
+        f"grid {args.step} deg": grid(engine, args.step),
+    }
+
+    print(f"CPUs available: {os.cpu_count()}")
+    print(f"{'Workload':<18} {'points':>9} {'workers':>8} {'seconds':>9} {'speedup':>8} {'identical':>10}")
+
+    for label, (lats, lons) in workloads.items():
+
+        serial = None
+
+        for workers in WORKER_COUNTS:
+            seconds, field = best_of(
+                lambda: build_seismic_field_parallel(
+                    lats,
+                    lons,
+                    engine.earthquake_catalogue,
+                    kernel=engine.kernel,
+                    workers=workers
+                ),
+                args.repeat
+            )
+
+            if serial is None:
+                serial = (seconds, field)
+
+            print(
+                f"{label:<18} {len(lats):>9,} {workers:>8} {seconds:>9.3f} "
+                f"{serial[0] / seconds:>7.2f}x {str(np.array_equal(serial[1], field)):>10}"
+            )
@@ -0,0 +1,99 @@
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from aitechture.core.hazard_models import seismic_risk
+from aitechture.core.risk_engine import RiskEngine
+
+SITES = [
+    (28.61, 77.21),
+    (19.07, 72.88),
+    (26.14, 91.74),
+    (34.08, 74.80),
+    (10.85, 76.27),
+]
+
+# Per-call budgets in bytes: (peak while the call runs, retained after
+# it). Peaks grow with the catalogue; anything retained is a leak.
+BUDGETS = {
+    "DataFrame, full scan": (320_000, 1_024),
+    "Catalogue, full scan": (192_000, 1_024),
+    "Catalogue + index": (64_000, 1_024),
+}
+
+
+def allocated_per_call(fn, repeat=50):
+
+    # Warm up once so lazily created state is not counted
+    fn(*SITES[0])
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+
+    peak = 0
+    for _ in range(repeat):
+        for lat, lon in SITES:
+            tracemalloc.reset_peak()
+            current, _ = tracemalloc.get_traced_memory()
+            fn(lat, lon)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    calls = repeat * len(SITES)
+    allocated = sum(
+        stat.size_diff for stat in after.compare_to(before, "filename")
+        if stat.size_diff > 0
+    )
+
+    return peak, allocated / calls
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Seismic scoring memory budget check (tracemalloc)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply the peak budgets, for larger catalogues")
+    args = parser.parse_args()
+
+    engine = RiskEngine()
+
+    paths = {
+        "DataFrame, full scan": lambda lat, lon: seismic_risk(
+            lat, lon, engine.earthquake, engine.seismic_distribution
+        ),
+        "Catalogue, full scan": lambda lat, lon: seismic_risk(
+            lat, lon, engine.earthquake_catalogue, engine.seismic_distribution
+        ),
+        "Catalogue + index": lambda lat, lon: seismic_risk(
+            lat,
+            lon,
+            engine.earthquake_catalogue,
+            engine.seismic_distribution,
+            earthquake_index=engine.earthquake_index
+        ),
+    }
+
+    failures = []
+
+    print(f"{'Seismic path':<22} {'peak bytes/call':>16} {'retained bytes/call':>20}")
+
+    for label, fn in paths.items():
+        peak, retained = allocated_per_call(fn)
+
+        peak_budget, retained_budget = BUDGETS[label]
+        peak_budget *= args.scale
+        status = "ok" if peak <= peak_budget and retained <= retained_budget else "FAIL"
+        print(f"{label:<22} {peak:>16,} {retained:>20,.0f}  "
+              f"(budget {peak_budget:,.0f} / {retained_budget:,.0f})  {status}")
+
+        if peak > peak_budget:
+            failures.append(f"{label}: peak {peak:,} bytes/call, budget {peak_budget:,.0f}")
+        if retained > retained_budget:
+            failures.append(f"{label}: retained {retained:,.0f} bytes/call, budget {retained_budget:,.0f}")
+
+    if failures:
+        sys.exit("\n".join(failures))
@@ -0,0 +1,84 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+PORT = 8765
+SITES = [(28.61, 77.21), (19.07, 72.88), (26.14, 91.74), (10.85, 76.27)]
+
+
+def _rollup(pid):
+    # RSS counts shared pages in full; PSS splits them between sharers
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                values[parts[0][:-1]] = int(parts[1]) / 1024
+    return values
+
+
+def _children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(p) for p in f.read().split()]
+
+
+def measure(workers, preload=True):
+
+    cmd = [
+        sys.executable, "-m", "gunicorn",
+        "-c", str(BASE_DIR / "gunicorn.conf.py"),
+        "--workers", str(workers),
+        "--bind", f"127.0.0.1:{PORT}",
+    ]
+    env = dict(os.environ, AITECHTURE_PRELOAD="1" if preload else "0")
+
+    master = subprocess.Popen(cmd, cwd=BASE_DIR, env=env, stderr=subprocess.DEVNULL)
+
+    try:
+        deadline = time.time() + 300
+        while time.time() < deadline:
+            if master.poll() is not None:
+                raise RuntimeError("gunicorn exited before becoming ready")
+            try:
+                if requests.get(f"http://127.0.0.1:{PORT}/readyz", timeout=1).ok:
+                    break
+            except requests.RequestException:
+                pass
+            time.sleep(0.5)
+
+        # Serve some traffic so every worker has touched the engine
+        for _ in range(workers * 4):
+            for lat, lon in SITES:
+                requests.post(
+                    f"http://127.0.0.1:{PORT}/evaluate",
+                    data={"lat": lat, "lon": lon}
+                )
+
+        pids = _children(master.pid)
+        stats = [_rollup(pid) for pid in pids]
+
+        return (
+            sum(s["Rss"] for s in stats) / len(stats),
+            sum(s["Pss"] for s in stats) / len(stats),
+            _rollup(master.pid)["Rss"],
+        )
+    finally:
+        master.send_signal(signal.SIGTERM)
+        master.wait()
+
+
+if __name__ == "__main__":
+
+    print(f"{'Mode':<11} {'Workers':>7} {'RSS/worker MiB':>15} {'PSS/worker MiB':>15} {'Master RSS MiB':>15}")
+
+    for preload in (True, False):
+        for workers in (1, 4, 8):
+            rss, pss, master_rss = measure(workers, preload)
+            mode = "preload" if preload else "no-preload"
+            print(f"{mode:<11} {workers:>7} {rss:>15.1f} {pss:>15.1f} {master_rss:>15.1f}")
@@ -0,0 +1,20 @@
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from aitechture.core.risk_engine import RiskEngine
+
+
+def report(label, engine):
+    print(f"{label:<12}: {engine.startup_seconds * 1000:9.1f} ms  (cache {engine.cache_status})")
+
+
+if __name__ == "__main__":
+
+    report("No cache", RiskEngine())
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        report("Cold start", RiskEngine(cache_dir=cache_dir))
+        report("Warm start", RiskEngine(cache_dir=cache_dir))
@@ -0,0 +1,270 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib.metadata import version
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "src"))
+
+from aitechture.core.hazard_models import (
+    flood_risk,
+    heatwave_risk,
+    landslide_risk,
+    seismic_risk,
+)
+from aitechture.core.risk_engine import RiskEngine
+
+# Fixed query set: Indian cities across every hazard regime
+SITES = [
+    (28.61, 77.21),   # Delhi
+    (19.07, 72.88),   # Mumbai
+    (13.08, 80.27),   # Chennai
+    (22.57, 88.36),   # Kolkata
+    (12.97, 77.59),   # Bengaluru
+    (17.39, 78.49),   # Hyderabad
+    (26.14, 91.74),   # Guwahati
+    (34.08, 74.80),   # Srinagar
+    (10.85, 76.27),   # Palakkad
+    (9.93, 76.27),    # Kochi
+    (26.91, 75.79),   # Jaipur
+    (27.02, 74.22),   # Nagaur (Thar)
+    (23.02, 72.57),   # Ahmedabad
+    (23.24, 69.67),   # Bhuj
+    (25.59, 85.14),   # Patna
+    (30.32, 78.03),   # Dehradun
+    (32.22, 76.32),   # Dharamshala
+    (20.30, 85.82),   # Bhubaneswar
+    (15.50, 73.83),   # Panaji
+    (11.41, 76.70),   # Ooty
+    (21.15, 79.09),   # Nagpur
+    (27.33, 88.61),   # Gangtok
+    (8.52, 76.94),    # Thiruvananthapuram
+    (24.82, 93.94),   # Imphal
+]
+
+# Bounding box for the random batch workload
+INDIA_BOUNDS = ((8.0, 35.0), (68.0, 97.0))
+
+BATCH_SIZE = 100_000
+
+
+# ----------------------------
+# Measurements
+# ----------------------------
+
+def _per_call_ms(fn, rounds):
+
+    # Latency of fn(lat, lon) for every fixed site, `rounds` times over
+
+    fn(*SITES[0])
+
+    samples = []
+    for _ in range(rounds):
+        for lat, lon in SITES:
+            started = time.perf_counter()
+            fn(lat, lon)
+            samples.append(time.perf_counter() - started)
+
+    return np.array(samples) * 1000
+
+
+def bench_startup(repeat):
+
+    # One build first so imports are not charged to __init__
+    RiskEngine()
+
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        RiskEngine()
+        seconds.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    RiskEngine()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "startup.init_ms": (np.median(seconds) * 1000, "ms", "lower"),
+        "startup.peak_mib": (peak / 2**20, "MiB", "lower"),
+    }
+
+
+def bench_evaluate(engine, rounds):
+
+    samples = _per_call_ms(engine.evaluate, rounds)
+
+    return {
+        "evaluate.p50_ms": (float(np.percentile(samples, 50)), "ms", "lower"),
+        "evaluate.p99_ms": (float(np.percentile(samples, 99)), "ms", "lower"),
+    }
+
+
+def bench_batch(engine, repeat, size=BATCH_SIZE):
+
+    rng = np.random.default_rng(0)
+    lats = rng.uniform(*INDIA_BOUNDS[0], size)
+    lons = rng.uniform(*INDIA_BOUNDS[1], size)
+
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        engine.evaluate_many(lats, lons)
+        seconds.append(time.perf_counter() - started)
+
+    return {
+        "batch.rows_per_s": (size / min(seconds), "rows/s", "higher"),
+    }
+
+
+def bench_components(engine, rounds):
+
+    # Each hazard model, material ranking and design generation on its
+    # own, with the engine's precomputed inputs
+
+    rows = {site: engine._nearest_row(*site) for site in SITES}
+
+    def risk_vector(lat, lon):
+        return np.array([0.6, 0.4, 0.7, 0.5, 0.3])
+
+    components = {
+        "seismic": lambda lat, lon: seismic_risk(
+            lat,
+            lon,
+            engine.earthquake_catalogue,
+            engine.seismic_distribution,
+            earthquake_index=engine.earthquake_index,
+            kernel=engine.kernel
+        ),
+        "flood": lambda lat, lon: flood_risk(
+            lat, lon, rows[(lat, lon)], engine.flood_distribution
+        ),
+        "heatwave": lambda lat, lon: heatwave_risk(
+            lat, lon, rows[(lat, lon)], engine.heat_distribution
+        ),
+        "landslide": lambda lat, lon: landslide_risk(
+            lat, lon, engine.landslide, landslide_index=engine.landslide_index
+        ),
+        "nearest_row": engine._nearest_row,
+        "materials": lambda lat, lon: engine.material_ranker.top_k(risk_vector(lat, lon)),
+        "design": lambda lat, lon: engine.design_engine.generate_design(
+            seismic=0.6,
+            flood=0.4,
+            heatwave=0.7,
+            landslide=0.3,
+            soil_type=rows[(lat, lon)]["Soil Type"],
+            elevation=rows[(lat, lon)]["Elevation_m"],
+            rainfall=rows[(lat, lon)]["Rainfall_mm"],
+            temperature=rows[(lat, lon)]["Temperature_C"]
+        ),
+    }
+
+    return {
+        f"component.{name}_us": (float(np.median(_per_call_ms(fn, rounds))) * 1000, "us", "lower")
+        for name, fn in components.items()
+    }
+
+
+# ----------------------------
+# Results
+# ----------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata():
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": version("numpy"),
+        "pandas": version("pandas"),
+        "scikit-learn": version("scikit-learn"),
+    }
+
+
+def compare(results, baseline, threshold):
+
+    # Metrics that got worse by more than `threshold` (relative) in their
+    # "better" direction; metrics missing from either side are skipped.
+
+    regressions = []
+
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None or not previous["value"]:
+            continue
+
+        change = (current["value"] - previous["value"]) / previous["value"]
+        worse = change if current["better"] == "lower" else -change
+
+        if worse > threshold:
+            regressions.append((name, previous["value"], current["value"], change))
+
+    return regressions
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="RiskEngine benchmark suite")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown flagged as a regression (default 0.10)")
+    parser.add_argument("--quick", action="store_true", help="fewer repetitions, for smoke runs")
+    args = parser.parse_args()
+
+    repeat = 1 if args.quick else 3
+    rounds = 5 if args.quick else 50
+
+    measured = bench_startup(repeat)
+
+    engine = RiskEngine()
+    measured.update(bench_evaluate(engine, rounds))
+    measured.update(bench_batch(engine, repeat, BATCH_SIZE // 10 if args.quick else BATCH_SIZE))
+    measured.update(bench_components(engine, rounds))
+
+    results = {
+        name: {"value": value, "unit": unit, "better": better}
+        for name, (value, unit, better) in measured.items()
+    }
+
+    print(f"{'Benchmark':<28} {'value':>12}  unit")
+    for name, result in results.items():
+        print(f"{name:<28} {result['value']:>12.3f}  {result['unit']}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+        regressions = compare(results, baseline, args.threshold)
+
+        for name, before, after, change in regressions:
+            print(f"REGRESSION {name}: {before:.3f} -> {after:.3f} ({change:+.1%})")
+
+        if regressions:
+            sys.exit(1)
+
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
@@ -0,0 +1,131 @@
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+from sklearn.metrics import adjusted_rand_score
+
+sys.path.append(str(Path(__file__).resolve().parents[1] / "src"))
+
+from aitechture.core.climate_zoning import (
+    ClimateZoning,
+    StreamingClimateZoning,
+    zoning_quality,
+)
+from aitechture.data_pipeline.data_loader import load_compiled
+from aitechture.data_pipeline.preprocessing import CLIMATE_ZONING_FEATURES
+
+CHUNK_ROWS = 250_000
+
+
+def synthetic_chunks(base, rows, seed, chunk_rows=CHUNK_ROWS):
+
+    # `rows` environmental points drawn from the compiled dataset with 5%
+    # jitter, generated chunk by chunk so the full set never exists
+
+    def chunks():
+        rng = np.random.default_rng(seed)
+        jitter = base.std(axis=0) * 0.05
+
+        for start in range(0, rows, chunk_rows):
+            n = min(chunk_rows, rows - start)
+            picked = base[rng.integers(0, len(base), n)]
+            yield picked + rng.normal(0, 1, picked.shape) * jitter
+
+    return chunks
+
+
+def traced(fn):
+    # Seconds and peak traced allocation (MiB) of fn(); NumPy arrays,
+    # including the generated chunks, are traced
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def id_agreement(a, b, features):
+    # Share of points given the same zone ID by two fitted zone models
+    return float((a.assign_batch(features) == b.assign_batch(features)).mean())
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Streaming climate zoning at scale")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--clusters", type=int, nargs="+", default=[5])
+    parser.add_argument("--full-limit", type=int, default=1_000_000,
+                        help="largest size also fitted with in-memory KMeans")
+    args = parser.parse_args()
+
+    base = load_compiled(columns=CLIMATE_ZONING_FEATURES).to_numpy(dtype=float)
+
+    print(f"{'rows':>11} {'k':>3} {'method':<10} {'seconds':>8} {'peak mem':>10} "
+          f"{'inertia/row':>12} {'silhouette':>11}")
+
+    for rows in args.rows:
+        for k in args.clusters:
+
+            chunks = synthetic_chunks(base, rows, seed=0)
+
+            streaming, seconds, peak = traced(
+                lambda: StreamingClimateZoning(n_clusters=k).fit(chunks)
+            )
+
+            report = streaming.report
+            print(f"{rows:>11,} {k:>3} {'streaming':<10} {seconds:>8.2f} {peak:>6.0f} MiB "
+                  f"{report['inertia'] / report['sample_rows']:>12.3f} {report['silhouette']:>11.3f}")
+
+            if rows > args.full_limit:
+                continue
+
+            def fit_full():
+                features = np.concatenate(list(chunks()))
+                zoning = ClimateZoning(n_clusters=k)
+                zoning.fit(features)
+                return zoning, features[np.random.default_rng(0).choice(len(features), 5000)]
+
+            (full, sample), seconds, peak = traced(fit_full)
+            report = zoning_quality(full.zone_model(), sample)
+
+            print(f"{rows:>11,} {k:>3} {'kmeans':<10} {seconds:>8.2f} {peak:>6.0f} MiB "
+                  f"{report['inertia'] / report['sample_rows']:>12.3f} {report['silhouette']:>11.3f}")
+
+
+    # ---- Zone ID stability between retrains ----
+    rows = min(args.rows)
+    k = args.clusters[0]
+
+    first = StreamingClimateZoning(n_clusters=k).fit(synthetic_chunks(base, rows, seed=1))
+    again = StreamingClimateZoning(n_clusters=k).fit(synthetic_chunks(base, rows, seed=1))
+    other = StreamingClimateZoning(n_clusters=k).fit(synthetic_chunks(base, rows, seed=2))
+    aligned = StreamingClimateZoning(n_clusters=k).fit(
+        synthetic_chunks(base, rows, seed=2), previous=first.zone_model()
+    )
+
+    full_first = ClimateZoning(n_clusters=k)
+    full_first.fit(np.concatenate(list(synthetic_chunks(base, rows, seed=1)())))
+    full_other = ClimateZoning(n_clusters=k)
+    full_other.fit(np.concatenate(list(synthetic_chunks(base, rows, seed=2)())))
+
+    identical = np.array_equal(first.zone_model().centroids, again.zone_model().centroids)
+
+    print()
+    print(f"Same data, same seed       : {'identical model' if identical else 'MODELS DIFFER'}")
+    print(f"New sample, streaming      : {id_agreement(first.zone_model(), other.zone_model(), base):.1%} "
+          "of compiled points keep their zone ID")
+    print(f"New sample, previous=      : {id_agreement(first.zone_model(), aligned.zone_model(), base):.1%} "
+          "of compiled points keep their zone ID")
+    print(f"New sample, partitions ARI : "
+          f"{adjusted_rand_score(first.zone_model().assign_batch(base), other.zone_model().assign_batch(base)):.2f} "
+          "(label-independent overlap; caps ID agreement)")
+    print(f"New sample, full KMeans    : {id_agreement(full_first.zone_model(), full_other.zone_model(), base):.1%} "
+          "of compiled points keep their zone ID")
+
+    if not identical:
+        sys.exit("Streaming zoning is not deterministic")
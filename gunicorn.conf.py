@@ -0,0 +1,30 @@
+import multiprocessing
+import os
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# gunicorn -c gunicorn.conf.py
+wsgi_app = "aitechture.api.wsgi:application"
+pythonpath = f"{BASE_DIR / 'src'},{BASE_DIR}"
+
+bind = os.environ.get("AITECHTURE_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("AITECHTURE_WORKERS", multiprocessing.cpu_count()))
+threads = int(os.environ.get("AITECHTURE_THREADS", 1))
+timeout = 120
+
+# Build the RiskEngine once before forking; workers inherit it.
+# AITECHTURE_PRELOAD=0 makes every worker build its own engine.
+preload_app = os.environ.get("AITECHTURE_PRELOAD", "1") == "1"
+
+# AITECHTURE_BACKGROUND_LOAD=1 lets workers answer liveness probes while
+# the engine loads. The load runs in a thread started after fork, so each
+# worker builds (or loads from AITECHTURE_CACHE_DIR) its own engine.
+background_load = os.environ.get("AITECHTURE_BACKGROUND_LOAD") == "1"
+
+
+def post_fork(server, worker):
+    if background_load:
+        from aitechture.api.app import warm_up
+
+        warm_up(background=True)
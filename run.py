@@ -1,16 +1,65 @@
+import argparse
+import json
+import os
 import sys
+import threading
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parent / "src"))
 
-from aitechture.core.risk_engine import RiskEngine
-
-engine = RiskEngine()
+# The engine modules pull in pandas and scikit-learn, so they are imported
+# on first use rather than here: `--help`, the web app's liveness probe and
+# anything that never evaluates stay fast to start.
+
+# Built by load_engine(); servers call it once before forking workers
+engine = None
+_engine_lock = threading.Lock()
+
+def build_result_cache():
+    from aitechture.core.result_cache import ResultCache
+
+    # Opt-in: rounding coordinates changes results, so the cache is only
+    # built when AITECHTURE_RESULT_CACHE_SIZE is set to a positive size
+    max_entries = int(os.environ.get("AITECHTURE_RESULT_CACHE_SIZE", 0))
+    if max_entries <= 0:
+        return None
+    return ResultCache(
+        max_entries=max_entries,
+        max_bytes=int(os.environ.get("AITECHTURE_RESULT_CACHE_MB", 64)) * 1024 * 1024,
+        precision=int(os.environ.get("AITECHTURE_RESULT_CACHE_PRECISION", 3))
+    )
+
+def load_engine():
+    global engine
+    if engine is None:
+        # Concurrent first callers wait for one build instead of each
+        # constructing their own engine
+        with _engine_lock:
+            if engine is None:
+                from aitechture.core.risk_engine import RiskEngine
+
+                # Set AITECHTURE_CACHE_DIR to reuse precomputed artifacts between processes
+                # AITECHTURE_RASTER_DIR switches on raster mode (see build-raster)
+                # AITECHTURE_BUILD_WORKERS parallelises the uncached precompute
+                # AITECHTURE_SEISMIC_KERNEL picks the attenuation kernel (default cauchy)
+                # AITECHTURE_FLOAT32=1 stores site features as float32
+                engine = RiskEngine(
+                    cache_dir=os.environ.get("AITECHTURE_CACHE_DIR"),
+                    kernel=os.environ.get("AITECHTURE_SEISMIC_KERNEL", "cauchy"),
+                    float32=os.environ.get("AITECHTURE_FLOAT32") == "1",
+                    result_cache=build_result_cache(),
+                    raster_dir=os.environ.get("AITECHTURE_RASTER_DIR"),
+                    workers=int(os.environ.get("AITECHTURE_BUILD_WORKERS", 1))
+                )
+    return engine
 
 def evaluate_location(lat, lon):
-    return engine.evaluate(lat, lon)
+    return load_engine().evaluate(lat, lon)
 
-if __name__ == "__main__":
+def evaluate_locations(lats, lons, top_k=5):
+    return load_engine().evaluate_many(lats, lons, top_k=top_k)
+
+def interactive():
     lat = float(input("Enter Latitude: "))
     lon = float(input("Enter Longitude: "))
 
@@ -46,4 +95,138 @@ if __name__ == "__main__":
     print(final_design["Roof"])
 
     print("\nWindow System:")
-    print(final_design["Window"])
\ No newline at end of file
+    print(final_design["Window"])
+
+
+def build_raster(args):
+    from aitechture.core.hazard_raster import build_hazard_raster, validate_raster
+    from aitechture.core.risk_engine import RiskEngine
+
+    # The raster only matches engines built with the same parameters
+    builder = RiskEngine(
+        cache_dir=os.environ.get("AITECHTURE_CACHE_DIR"),
+        kernel=os.environ.get("AITECHTURE_SEISMIC_KERNEL", "cauchy"),
+        float32=os.environ.get("AITECHTURE_FLOAT32") == "1"
+    )
+
+    raster = build_hazard_raster(
+        builder, step=args.step, margin=args.margin, workers=args.workers
+    )
+    raster.save(args.out)
+
+    print(f"Raster {raster.shape[0]} x {raster.shape[1]} written to {args.out}")
+
+    if args.validate:
+        print(json.dumps(validate_raster(builder, raster, samples=args.validate), indent=2))
+
+
+def convert_data(args):
+    from aitechture.data_pipeline.data_loader import convert_datasets
+
+    for name, bundle in convert_datasets().items():
+        print(f"{name:<24} -> {bundle}")
+
+
+def score(args):
+    from aitechture.core.bulk_scoring import score_file
+
+    def progress(rows, seconds):
+        print(f"\r{rows:,} rows  {rows / max(seconds, 1e-9):,.0f} rows/s", end="", file=sys.stderr)
+
+    stats = score_file(
+        load_engine(),
+        args.input,
+        args.output,
+        lat_column=args.lat_column,
+        lon_column=args.lon_column,
+        keep_columns=args.keep,
+        top_k=args.top_k,
+        chunk_rows=args.chunk_rows,
+        progress=progress
+    )
+
+    print(file=sys.stderr)
+    print(
+        f"Scored {stats['rows']:,} rows ({stats['invalid_rows']:,} with invalid coordinates) "
+        f"in {stats['seconds']:.1f} s: {stats['rows_per_second']:,.0f} rows/s -> {args.output}"
+    )
+
+
+def fit_zones(args):
+    from aitechture.core.climate_zoning import StreamingClimateZoning
+    from aitechture.data_pipeline.data_loader import DATA_DIR, iter_chunks
+    from aitechture.data_pipeline.preprocessing import CLIMATE_ZONING_FEATURES
+
+    path = args.input or DATA_DIR / "compiled_clean.csv"
+
+    def chunks():
+        return iter_chunks(path, CLIMATE_ZONING_FEATURES, chunk_rows=args.chunk_rows)
+
+    for k in args.clusters:
+        zoning = StreamingClimateZoning(
+            n_clusters=k,
+            epochs=args.epochs,
+            sample_size=args.sample,
+            random_state=args.seed
+        ).fit(chunks)
+
+        print(json.dumps(zoning.report))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI-Techture multi-hazard risk engine")
+    commands = parser.add_subparsers(dest="command")
+
+    raster = commands.add_parser(
+        "build-raster", help="precompute hazard rasters for raster mode"
+    )
+    raster.add_argument("--out", required=True, help="output directory")
+    raster.add_argument("--step", type=float, default=0.05, help="grid step in degrees")
+    raster.add_argument("--margin", type=float, default=0.5, help="padding around the data extent in degrees")
+    raster.add_argument("--workers", type=int, default=None, help="build processes (default: CPU count)")
+    raster.add_argument("--validate", type=int, default=5000, metavar="N",
+                        help="compare against exact evaluation at N random sites (0 to skip)")
+
+    commands.add_parser(
+        "convert-data", help="convert data/*.csv to columnar bundles for faster loading"
+    )
+
+    scorer = commands.add_parser(
+        "score", help="score a CSV or Parquet file of sites in chunks"
+    )
+    scorer.add_argument("input", help="CSV or Parquet file with one site per row")
+    scorer.add_argument("output", help="CSV or Parquet file to write (by extension)")
+    scorer.add_argument("--lat-column", default="Latitude")
+    scorer.add_argument("--lon-column", default="Longitude")
+    scorer.add_argument("--keep", nargs="*", default=[], metavar="COLUMN",
+                        help="input columns copied to the output, e.g. a site id")
+    scorer.add_argument("--top-k", type=int, default=5, help="materials per site")
+    scorer.add_argument("--chunk-rows", type=int, default=50_000,
+                        help="rows read and scored at a time; bounds memory")
+
+    zones = commands.add_parser(
+        "fit-zones", help="fit streaming climate zoning and report its quality per cluster count"
+    )
+    zones.add_argument("--input", help="CSV with the climate feature columns (default: compiled dataset)")
+    zones.add_argument("--clusters", type=int, nargs="+", default=[5], metavar="K")
+    zones.add_argument("--chunk-rows", type=int, default=1_000_000, help="rows read at a time")
+    zones.add_argument("--epochs", type=int, default=3, help="mini-batch passes over the data")
+    zones.add_argument("--sample", type=int, default=5000, help="rows sampled for inertia and silhouette")
+    zones.add_argument("--seed", type=int, default=42)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build-raster":
+        build_raster(args)
+    elif args.command == "convert-data":
+        convert_data(args)
+    elif args.command == "score":
+        score(args)
+    elif args.command == "fit-zones":
+        fit_zones(args)
+    else:
+        interactive()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,145 @@ from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parents[3]))
 
-from flask import Flask, request
-from run import evaluate_location
+import numbers
+import os
+import threading
+
+import time
+
+import numpy as np
+from flask import Flask, Response, g, jsonify, request
+
+import run
+from run import evaluate_location, evaluate_locations
+from aitechture.core.instrumentation import metrics, server_timing_header, timed
 
 app = Flask(__name__)
 
+# Largest number of sites accepted by one /api/v1/evaluate/batch request
+MAX_BATCH_SIZE = int(os.environ.get("AITECHTURE_MAX_BATCH_SIZE", 50_000))
+
+DESIGN_PARTS = ["Structural", "Foundation", "Roof", "Window"]
+
+# AITECHTURE_SERVER_TIMING=1 adds a Server-Timing header with the stage
+# breakdown of each request (needs metrics enabled)
+SERVER_TIMING = os.environ.get("AITECHTURE_SERVER_TIMING") == "1"
+
+
+# --------------------------------------------------
+# Engine Lifecycle
+# --------------------------------------------------
+
+# Background loader thread, if one was started in this process
+_loader = None
+_loader_lock = threading.Lock()
+
+
+def warm_up(background=False):
+    # Build the shared engine. In the background the server can answer
+    # liveness probes while readiness stays 503 until the engine exists.
+    global _loader
+
+    if not background:
+        run.load_engine()
+        return
+
+    with _loader_lock:
+        if _loader is None or not _loader.is_alive():
+            _loader = threading.Thread(target=run.load_engine, daemon=True)
+            _loader.start()
+
+
+@app.before_request
+def _ensure_engine_loading():
+    # Servers that never call warm_up() (e.g. `flask run`) start the load
+    # on the first request; until it finishes, readiness and evaluation
+    # answer 503 as in background mode
+    if run.engine is None:
+        warm_up(background=True)
+
+
+# --------------------------------------------------
+# Metrics
+# --------------------------------------------------
+
+@app.before_request
+def _start_timing():
+    if not metrics.enabled:
+        return
+    g.request_started = time.perf_counter()
+    if SERVER_TIMING:
+        g.timing_token = metrics.start_collecting()
+
+
+@app.after_request
+def _finish_timing(response):
+    if "request_started" not in g:
+        return response
+
+    elapsed = time.perf_counter() - g.request_started
+
+    if "timing_token" in g:
+        timings = metrics.stop_collecting(g.pop("timing_token"))
+        timings.append(("total", elapsed))
+        response.headers["Server-Timing"] = server_timing_header(timings)
+
+    metrics.observe(f"http.{request.endpoint}", elapsed)
+    return response
+
+
+@app.teardown_request
+def _drop_timing(exc):
+    # after_request is skipped when a view raises
+    if "timing_token" in g:
+        metrics.stop_collecting(g.pop("timing_token"))
+
+
+@app.route("/metrics")
+def prometheus_metrics():
+    engine = run.engine
+    lines = [metrics.render_prometheus().rstrip("\n")]
+
+    lines.append("# TYPE aitechture_engine_ready gauge")
+    lines.append(f"aitechture_engine_ready {int(engine is not None)}")
+
+    if engine is not None and engine.result_cache is not None:
+        stats = engine.result_cache.stats()
+        for name in ["hits", "misses", "evictions"]:
+            lines.append(f"# TYPE aitechture_result_cache_{name}_total counter")
+            lines.append(f"aitechture_result_cache_{name}_total {stats[name]}")
+        lines.append("# TYPE aitechture_result_cache_entries gauge")
+        lines.append(f"aitechture_result_cache_entries {stats['entries']}")
+
+    if engine is not None:
+        lines.append("# TYPE aitechture_engine_memory_bytes gauge")
+        for component, size in engine.memory_usage().items():
+            lines.append(f'aitechture_engine_memory_bytes{{component="{component}"}} {size}')
+
+    return Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/healthz")
+def healthz():
+    return jsonify({"status": "alive"})
+
+
+@app.route("/readyz")
+def readyz():
+    engine = run.engine
+
+    if engine is None:
+        return jsonify({"status": "loading"}), 503
+
+    return jsonify({
+        "status": "ready",
+        "cache": engine.cache_status,
+        "startup_seconds": round(engine.startup_seconds, 3),
+        "result_cache": engine.result_cache.stats() if engine.result_cache else None,
+        "seismic_approximation": engine.seismic_approximation,
+    })
+
+
 @app.route("/")
 def home():
     return """
@@ -81,10 +215,20 @@ def home():
 
 @app.route("/evaluate", methods=["POST"])
 def evaluate():
-    lat = float(request.form["lat"])
-    lon = float(request.form["lon"])
+    if run.engine is None:
+        return "Risk engine is still loading, try again shortly.", 503
+
+    try:
+        lat = _form_coordinate(request.form.get("lat"), "lat", 90)
+        lon = _form_coordinate(request.form.get("lon"), "lon", 180)
+    except ValueError as e:
+        return f"Invalid input: {e}", 400
+
+    return _render_report(lat, lon, evaluate_location(lat, lon))
+
 
-    result = evaluate_location(lat, lon)
+@timed("render.html")
+def _render_report(lat, lon, result):
     design = result["Design_Recommendations"]
     materials = result["Top_Materials"].head(5)
 
@@ -243,5 +387,168 @@ def evaluate():
     </html>
     """
 
+# --------------------------------------------------
+# JSON API
+# --------------------------------------------------
+
+def _error(message, status=400):
+    return jsonify({"error": message}), status
+
+
+def _is_number(value):
+    # JSON numbers only: no booleans, numeric strings or nested lists
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def _coordinate(value, name, limit):
+    if value is None:
+        raise ValueError(f"'{name}' is required and must be a number")
+
+    if not _is_number(value):
+        raise ValueError(f"'{name}' must be a number")
+
+    value = float(value)
+    if not np.isfinite(value) or abs(value) > limit:
+        raise ValueError(f"'{name}' must be between -{limit} and {limit}")
+
+    return value
+
+
+def _form_coordinate(value, name, limit):
+    # HTML form fields always arrive as text
+    if value is None or not value.strip():
+        raise ValueError(f"'{name}' is required and must be a number")
+
+    try:
+        value = float(value)
+    except ValueError:
+        raise ValueError(f"'{name}' must be a number")
+
+    return _coordinate(value, name, limit)
+
+
+def _coordinate_array(values, name, limit):
+    if not isinstance(values, list):
+        raise ValueError(f"'{name}' must be a list of numbers")
+
+    if not all(_is_number(v) for v in values):
+        raise ValueError(f"'{name}' must only contain numbers")
+
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 1:
+        raise ValueError(f"'{name}' must be a flat list of numbers")
+
+    bad = ~np.isfinite(values) | (np.abs(values) > limit)
+    if bad.any():
+        raise ValueError(
+            f"'{name}[{int(np.argmax(bad))}]' must be between -{limit} and {limit}"
+        )
+
+    return values
+
+
+def _top_k(payload):
+    top_k = payload.get("top_k", 5)
+    if isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1:
+        raise ValueError("'top_k' must be a positive integer")
+    return top_k
+
+
+@app.route("/api/v1/evaluate", methods=["POST"])
+def api_evaluate():
+    if run.engine is None:
+        return _error("Risk engine is still loading", 503)
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return _error("Request body must be a JSON object")
+
+    try:
+        lat = _coordinate(payload.get("lat"), "lat", 90)
+        lon = _coordinate(payload.get("lon"), "lon", 180)
+        top_k = _top_k(payload)
+    except ValueError as e:
+        return _error(str(e))
+
+    result = run.engine.evaluate(lat, lon, top_k=top_k)
+    design = result["Design_Recommendations"]
+    materials = result["Top_Materials"]
+
+    return jsonify({
+        "lat": lat,
+        "lon": lon,
+        "Seismic_Risk": result["Seismic_Risk"],
+        "Flood_Risk": result["Flood_Risk"],
+        "Heatwave_Risk": result["Heatwave_Risk"],
+        "Landslide_Risk": result["Landslide_Risk"],
+        "Top_Materials": [
+            {"Material": name, "Suitability_Score": float(score)}
+            for name, score in zip(materials["Material"], materials["Suitability_Score"])
+        ],
+        "Design_Recommendations": design,
+    })
+
+
+@app.route("/api/v1/evaluate/batch", methods=["POST"])
+def api_evaluate_batch():
+
+    # Body: {"lats": [...], "lons": [...], "top_k": 5}
+    #   or  {"sites": [{"lat": ..., "lon": ...}, ...], "top_k": 5}
+    # Response is columnar: one list entry per site, in request order.
+
+    if run.engine is None:
+        return _error("Risk engine is still loading", 503)
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return _error("Request body must be a JSON object")
+
+    try:
+        if "sites" in payload:
+            sites = payload["sites"]
+            if not isinstance(sites, list) or not all(isinstance(s, dict) for s in sites):
+                raise ValueError("'sites' must be a list of {\"lat\", \"lon\"} objects")
+            lats = [s.get("lat") for s in sites]
+            lons = [s.get("lon") for s in sites]
+        else:
+            lats = payload.get("lats")
+            lons = payload.get("lons")
+
+        lats = _coordinate_array(lats, "lats", 90)
+        lons = _coordinate_array(lons, "lons", 180)
+        top_k = _top_k(payload)
+    except ValueError as e:
+        return _error(str(e))
+
+    if len(lats) != len(lons):
+        return _error("'lats' and 'lons' must have the same length")
+
+    if len(lats) == 0:
+        return _error("At least one site is required")
+
+    if len(lats) > MAX_BATCH_SIZE:
+        return _error(f"At most {MAX_BATCH_SIZE} sites per request", 413)
+
+    result = evaluate_locations(lats, lons, top_k=top_k)
+    names = run.engine.materials["Material"].values
+
+    return jsonify({
+        "count": len(lats),
+        "Seismic_Risk": result["Seismic_Risk"].tolist(),
+        "Flood_Risk": result["Flood_Risk"].tolist(),
+        "Heatwave_Risk": result["Heatwave_Risk"].tolist(),
+        "Landslide_Risk": result["Landslide_Risk"].tolist(),
+        "Top_Materials": names[result["Top_Material_Index"]].tolist(),
+        "Top_Material_Scores": result["Top_Material_Score"].tolist(),
+        "Primary_Hazard_Driver": result["Primary_Hazard_Driver"].tolist(),
+        "Final_Integrated_Design": {
+            part: result["Final_Integrated_Design"][part].tolist()
+            for part in DESIGN_PARTS
+        },
+        "Design_Strength_Index": result["Design_Strength_Index"].tolist(),
+    })
+
+
 if __name__ == "__main__":
+    warm_up()
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,23 @@
+import gc
+import os
+
+from aitechture.api.app import app, warm_up
+
+# Production entry point (see gunicorn.conf.py). With preload_app the
+# engine is built once in the master process; forked workers then share
+# its read-only NumPy buffers copy-on-write instead of each building
+# their own copy.
+#
+# AITECHTURE_BACKGROUND_LOAD=1 skips the build here: threads do not
+# survive fork, so a loader thread started in the master would never
+# finish in the workers (and could leave them holding the engine lock).
+# gunicorn.conf.py's post_fork hook starts the load in each worker.
+if os.environ.get("AITECHTURE_BACKGROUND_LOAD") != "1":
+    warm_up()
+
+# Move everything allocated so far out of the collector's generations, so
+# garbage collection in the workers does not write to (and so un-share)
+# the pages inherited from the master.
+gc.freeze()
+
+application = app
@@ -0,0 +1,197 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from aitechture.core.design_engine import DESIGN_PARTS
+
+RISK_COLUMNS = ["Seismic_Risk", "Flood_Risk", "Heatwave_Risk", "Landslide_Risk"]
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+def _is_parquet(path):
+    return Path(path).suffix.lower() in (".parquet", ".pq")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet input/output requires pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+# ----------------------------
+# Reading
+# ----------------------------
+
+def read_chunks(path, columns, chunk_rows=DEFAULT_CHUNK_ROWS):
+
+    # Yields DataFrames of at most chunk_rows rows holding only `columns`,
+    # so memory does not grow with the file size.
+
+    if _is_parquet(path):
+        pa = _require_pyarrow()
+        reader = pa.parquet.ParquetFile(path)
+
+        for batch in reader.iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+        return
+
+    yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows)
+
+
+# ----------------------------
+# Writing
+# ----------------------------
+
+class ChunkWriter:
+
+    # Appends result frames to a CSV (header written once) or to a
+    # Parquet file (one row group per chunk).
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.parquet = _is_parquet(path)
+        self._file = None
+        self._writer = None
+
+    def write(self, frame):
+
+        if self.parquet:
+            pa = _require_pyarrow()
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+
+            if self._writer is None:
+                self._writer = pa.parquet.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+            return
+
+        header = self._file is None
+        if header:
+            self._file = open(self.path, "w", newline="")
+        frame.to_csv(self._file, header=header, index=False)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ----------------------------
+# Scoring
+# ----------------------------
+
+def flatten_results(result, material_names, top_k, n_rows, valid):
+
+    # evaluate_many() output as one flat column per value. Rows with
+    # invalid coordinates (valid == False) are left empty.
+
+    columns = {}
+
+    def place(values, fill):
+        if valid.all():
+            return values
+        out = np.full(n_rows, fill, dtype=values.dtype if fill is np.nan else object)
+        out[valid] = values
+        return out
+
+    for name in RISK_COLUMNS:
+        columns[name] = place(result[name], np.nan)
+
+    names = material_names[result["Top_Material_Index"]]
+    for rank in range(top_k):
+        columns[f"Material_{rank + 1}"] = place(names[:, rank], None)
+        columns[f"Material_{rank + 1}_Score"] = place(result["Top_Material_Score"][:, rank], np.nan)
+
+    columns["Primary_Hazard_Driver"] = place(result["Primary_Hazard_Driver"], None)
+
+    for part in DESIGN_PARTS:
+        columns[f"Design_{part}"] = place(result["Final_Integrated_Design"][part], None)
+
+    columns["Design_Strength_Index"] = place(result["Design_Strength_Index"], np.nan)
+
+    frame = pd.DataFrame(columns)
+
+    # Text columns keep one dtype even for chunks where every row is empty
+    for name, values in frame.items():
+        if values.dtype == object:
+            frame[name] = values.astype("str")
+
+    return frame
+
+
+def score_file(engine,
+               input_path,
+               output_path,
+               lat_column="Latitude",
+               lon_column="Longitude",
+               keep_columns=(),
+               top_k=5,
+               chunk_rows=DEFAULT_CHUNK_ROWS,
+               progress=None):
+
+    # Streams input_path through engine.evaluate_many() chunk by chunk and
+    # appends flat results to output_path. `keep_columns` are copied from
+    # the input (e.g. a site id), followed by the parsed coordinates under
+    # their input names. progress(rows_done, seconds) is called after
+    # every chunk.
+
+    keep_columns = list(keep_columns)
+
+    clashing = [col for col in keep_columns if col in (lat_column, lon_column)]
+    if clashing:
+        raise ValueError(f"Kept columns clash with the coordinate columns: {clashing}")
+
+    columns = list(dict.fromkeys([*keep_columns, lat_column, lon_column]))
+
+    material_names = engine.materials["Material"].to_numpy(dtype=object)
+    top_k = min(top_k, len(material_names))
+
+    rows = 0
+    invalid = 0
+    started = time.perf_counter()
+
+    with ChunkWriter(output_path) as writer:
+        for chunk in read_chunks(input_path, columns, chunk_rows):
+
+            lats = pd.to_numeric(chunk[lat_column], errors="coerce").to_numpy(dtype=float)
+            lons = pd.to_numeric(chunk[lon_column], errors="coerce").to_numpy(dtype=float)
+
+            valid = (
+                np.isfinite(lats) & np.isfinite(lons)
+                & (np.abs(lats) <= 90) & (np.abs(lons) <= 180)
+            )
+
+            result = engine.evaluate_many(lats[valid], lons[valid], top_k=top_k)
+            flat = flatten_results(result, material_names, top_k, len(chunk), valid)
+
+            out = chunk[keep_columns].reset_index(drop=True)
+            out[lat_column] = lats
+            out[lon_column] = lons
+            writer.write(pd.concat([out, flat], axis=1))
+
+            rows += len(chunk)
+            invalid += int((~valid).sum())
+
+            if progress is not None:
+                progress(rows, time.perf_counter() - started)
+
+    seconds = time.perf_counter() - started
+
+    return {
+        "rows": rows,
+        "invalid_rows": invalid,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds > 0 else float("inf"),
+    }
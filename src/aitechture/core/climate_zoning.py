@@ -1,11 +1,15 @@
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
 
 
 class ClimateZoning:
 
+    # scikit-learn is imported on construction, so importing this module
+    # (e.g. for ZoneModel) stays cheap
+
     def __init__(self, n_clusters=5):
+        from sklearn.cluster import KMeans
+        from sklearn.preprocessing import StandardScaler
+
         self.n_clusters = n_clusters
         self.scaler = StandardScaler()
         self.model = KMeans(n_clusters=n_clusters, random_state=42)
@@ -17,4 +21,228 @@ class ClimateZoning:
 
     def predict(self, point_features):
         scaled_point = self.scaler.transform([point_features])
-        return self.model.predict(scaled_point)[0]
\ No newline at end of file
+        return self.model.predict(scaled_point)[0]
+
+    def zone_model(self):
+        return ZoneModel.from_zoning(self)
+
+
+class ZoneModel:
+
+    # The fitted scaler and centroids as plain arrays. A zone is the
+    # nearest centroid in standardised space, the rule KMeans.predict
+    # applies, without sklearn's per-call input validation.
+
+    def __init__(self, mean, scale, centroids):
+        self.mean = np.asarray(mean, dtype=float)
+        self.scale = np.asarray(scale, dtype=float)
+        self.centroids = np.asarray(centroids, dtype=float)
+
+        # |c|^2 term of the expanded squared distance, per centroid
+        self.centroid_norms = (self.centroids ** 2).sum(axis=1)
+
+    @classmethod
+    def from_zoning(cls, zoning):
+        return cls(
+            zoning.scaler.mean_,
+            zoning.scaler.scale_,
+            zoning.model.cluster_centers_
+        )
+
+    def assign(self, point_features):
+        scaled = (np.asarray(point_features, dtype=float) - self.mean) / self.scale
+        return int(np.argmin(((self.centroids - scaled) ** 2).sum(axis=1)))
+
+    def assign_batch(self, features):
+        scaled = (np.asarray(features, dtype=float) - self.mean) / self.scale
+
+        # |x|^2 is the same for every centroid, so it drops out of the argmin
+        distances = self.centroid_norms - 2 * scaled @ self.centroids.T
+
+        return np.argmin(distances, axis=1)
+
+
+# ----------------------------
+# Out-of-Core Zoning
+# ----------------------------
+
+def zoning_quality(zone_model, features):
+
+    # Quality of a fitted zone model on a sample of unscaled features:
+    # inertia (summed squared distance to the assigned centroid, in
+    # standardised units) and the mean silhouette coefficient
+
+    from sklearn import config_context
+    from sklearn.metrics import silhouette_score
+
+    features = np.asarray(features, dtype=float)
+
+    zones = zone_model.assign_batch(features)
+    scaled = (features - zone_model.mean) / zone_model.scale
+
+    inertia = float(((scaled - zone_model.centroids[zones]) ** 2).sum())
+
+    silhouette = None
+    if 1 < len(np.unique(zones)) < len(scaled):
+        # Pairwise distances in blocks of at most 64 MiB
+        with config_context(working_memory=64):
+            silhouette = float(silhouette_score(scaled, zones))
+
+    return {
+        "n_clusters": len(zone_model.centroids),
+        "sample_rows": len(scaled),
+        "inertia": inertia,
+        "silhouette": silhouette,
+    }
+
+
+class RunningMoments:
+
+    # Per-column count, mean and sum of squared deviations, merged chunk
+    # by chunk (Chan et al.), so standardisation needs one pass and no
+    # more memory than a chunk.
+
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self.m2 = None
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk, dtype=float)
+        n = len(chunk)
+        if n == 0:
+            return
+
+        mean = chunk.mean(axis=0)
+        m2 = ((chunk - mean) ** 2).sum(axis=0)
+
+        if self.count == 0:
+            self.count, self.mean, self.m2 = n, mean, m2
+            return
+
+        total = self.count + n
+        delta = mean - self.mean
+
+        self.mean = self.mean + delta * n / total
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    @property
+    def scale(self):
+        # Population standard deviation; constant columns scale by 1, as
+        # in StandardScaler
+        std = np.sqrt(self.m2 / self.count)
+        return np.where(std == 0, 1.0, std)
+
+
+class StreamingClimateZoning:
+
+    # ClimateZoning for datasets that do not fit in memory. fit() takes a
+    # callable returning a fresh iterator of feature chunks (frames or 2-D
+    # arrays) and makes 1 + epochs passes over them:
+    #
+    #   pass 1    streaming mean / std, plus a uniform sample of rows
+    #   passes    MiniBatchKMeans.partial_fit on standardised mini-batches
+    #
+    # Centroids are seeded by k-means++ on the sample and every random
+    # choice derives from random_state, so a retrain on the same data
+    # gives the same model. KMeans numbers clusters arbitrarily, so zones
+    # are renumbered: to match the nearest centroids of `previous` (the
+    # zone model being replaced) when given, else in lexicographic order
+    # of their centroids.
+
+    def __init__(self,
+                 n_clusters=5,
+                 batch_size=4096,
+                 epochs=3,
+                 sample_size=5000,
+                 random_state=42):
+
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.sample_size = sample_size
+        self.random_state = random_state
+
+        self._zone_model = None
+        self.report = None
+
+    def fit(self, chunks, previous=None):
+
+        from sklearn.cluster import MiniBatchKMeans, kmeans_plusplus
+
+        rng = np.random.default_rng(self.random_state)
+
+        # ---- Pass 1: moments and a bottom-k sample (smallest random keys) ----
+        moments = RunningMoments()
+        sample = np.empty((0, 0))
+        sample_keys = np.empty(0)
+
+        for chunk in chunks():
+            chunk = np.asarray(chunk, dtype=float)
+            moments.update(chunk)
+
+            keys = np.concatenate([sample_keys, rng.random(len(chunk))])
+            rows = np.concatenate([sample, chunk]) if len(sample) else chunk
+
+            keep = np.argsort(keys, kind="stable")[:self.sample_size]
+            sample, sample_keys = rows[keep], keys[keep]
+
+        if moments.count < self.n_clusters:
+            raise ValueError(
+                f"{moments.count} rows cannot be split into {self.n_clusters} zones"
+            )
+
+        mean, scale = moments.mean, moments.scale
+        scaled_sample = (sample - mean) / scale
+
+        # ---- Passes 2..: mini-batch k-means ----
+        init, _ = kmeans_plusplus(
+            scaled_sample, self.n_clusters, random_state=self.random_state
+        )
+
+        model = MiniBatchKMeans(
+            n_clusters=self.n_clusters,
+            init=init,
+            n_init=1,
+            batch_size=self.batch_size,
+            random_state=self.random_state
+        )
+
+        for _ in range(self.epochs):
+            for chunk in chunks():
+                scaled = (np.asarray(chunk, dtype=float) - mean) / scale
+                scaled = scaled[rng.permutation(len(scaled))]
+
+                for start in range(0, len(scaled), self.batch_size):
+                    batch = scaled[start:start + self.batch_size]
+
+                    # partial_fit needs at least one row per cluster
+                    if len(batch) >= self.n_clusters:
+                        model.partial_fit(batch)
+
+        centroids = model.cluster_centers_
+
+        if previous is not None and len(previous.centroids) == self.n_clusters:
+            from scipy.optimize import linear_sum_assignment
+
+            # Previous centroids in this model's standardised units
+            anchors = (previous.centroids * previous.scale + previous.mean - mean) / scale
+            cost = ((anchors[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=-1)
+            centroids = centroids[linear_sum_assignment(cost)[1]]
+        else:
+            centroids = centroids[np.lexsort(centroids.T[::-1])]
+
+        self._zone_model = ZoneModel(mean, scale, centroids)
+        self.report = zoning_quality(self._zone_model, sample)
+        self.report["rows"] = moments.count
+
+        return self
+
+    def zone_model(self):
+        if self._zone_model is None:
+            raise RuntimeError("StreamingClimateZoning is not fitted")
+        return self._zone_model
+
+    def predict(self, point_features):
+        return self.zone_model().assign(point_features)
@@ -6,6 +6,19 @@ DATA_DIR = BASE_DIR / "data"
 import numpy as np
 import pandas as pd
 
+HAZARDS = ["Earthquake", "Flood", "Heatwave", "Landslide"]
+DESIGN_PARTS = ["Structural", "Foundation", "Roof", "Window"]
+CLIMATE_CATEGORIES = ["Elevation", "Precipitation", "Weather"]
+
+
+def _first_rows(df, key_columns):
+    # Same row a boolean-mask filter + .iloc[0] would pick
+    table = {}
+    for record in df.to_dict("records"):
+        key = tuple(record[c] for c in key_columns)
+        table.setdefault(key if len(key) > 1 else key[0], record)
+    return table
+
 
 class DesignEngine:
 
@@ -18,6 +31,56 @@ class DesignEngine:
         self.soil_rules = pd.read_csv(soil_rules_path)
         self.climate_rules = pd.read_csv(climate_rules_path)
 
+        self._compile_rules()
+
+    # --------------------------------------------------
+    # Compiled Rule Tables
+    # --------------------------------------------------
+
+    def _compile_rules(self):
+
+        # Dict lookups keyed by hazard, soil type and (category, severity)
+        self.hazard_table = _first_rows(self.hazard_rules, ["Hazard"])
+        self.soil_table = _first_rows(self.soil_rules, ["Soil_Type"])
+        self.climate_table = _first_rows(
+            self.climate_rules, ["Category", "Severity_Level"]
+        )
+
+        # Array form for generate_design_batch: every recommendation gets
+        # a column index per design part.
+        self._vocab = {part: [] for part in DESIGN_PARTS}
+        self._vocab_index = {part: {} for part in DESIGN_PARTS}
+
+        for table in [self.hazard_table, self.soil_table, self.climate_table]:
+            for rule in table.values():
+                for part in DESIGN_PARTS:
+                    rec = rule.get(f"{part}_Recommendation")
+                    if rec is not None and rec not in self._vocab_index[part]:
+                        self._vocab_index[part][rec] = len(self._vocab[part])
+                        self._vocab[part].append(rec)
+
+        self._vocab = {
+            part: np.array(names, dtype=object)
+            for part, names in self._vocab.items()
+        }
+
+        self._soil_types = pd.Index(list(self.soil_table))
+        self._soil_weight = {
+            part: np.array(
+                [rule[f"{part}_Weight"] for rule in self.soil_table.values()]
+                + [1.0]
+            )
+            for part in ["Structural", "Foundation"]
+        }
+        self._soil_rec = {
+            part: np.array(
+                [self._vocab_index[part][rule[f"{part}_Recommendation"]]
+                 for rule in self.soil_table.values()]
+                + [-1]
+            )
+            for part in ["Structural", "Foundation"]
+        }
+
     # --------------------------------------------------
     # Helper
     # --------------------------------------------------
@@ -63,15 +126,11 @@ class DesignEngine:
 
         for hazard, intensity in hazard_vector.items():
 
-            row = self.hazard_rules[
-                self.hazard_rules["Hazard"] == hazard
-            ]
+            row = self.hazard_table.get(hazard)
 
-            if row.empty:
+            if row is None:
                 continue
 
-            row = row.iloc[0]
-
             structural_weight = intensity * row["Structural_Weight"]
             foundation_weight = intensity * row["Foundation_Weight"]
             roof_weight = intensity * row["Roof_Weight"]
@@ -106,13 +165,9 @@ class DesignEngine:
 
         soil_adjustments = {}
 
-        soil_row = self.soil_rules[
-            self.soil_rules["Soil_Type"] == soil_type
-        ]
-
-        if not soil_row.empty:
-            soil_row = soil_row.iloc[0]
+        soil_row = self.soil_table.get(soil_type)
 
+        if soil_row is not None:
             structural_score *= soil_row["Structural_Weight"]
             foundation_score *= soil_row["Foundation_Weight"]
 
@@ -146,16 +201,11 @@ class DesignEngine:
             ("Weather", weather_cat)
         ]:
 
-            row = self.climate_rules[
-                (self.climate_rules["Category"] == category) &
-                (self.climate_rules["Severity_Level"] == level)
-            ]
+            row = self.climate_table.get((category, level))
 
-            if row.empty:
+            if row is None:
                 continue
 
-            row = row.iloc[0]
-
             climate_factor = 0.35
 
             structural_score += row["Structural_Weight"] * climate_factor
@@ -221,4 +271,173 @@ class DesignEngine:
             },
 
             "Design_Strength_Index": round(float(total_score), 3)
-        }
\ No newline at end of file
+        }
+
+    # --------------------------------------------------
+    # Batch Design Evaluation
+    # --------------------------------------------------
+
+    @staticmethod
+    def _vote_winner(votes, rank):
+
+        # Highest vote per row; ties go to the recommendation that was
+        # voted for first, matching max() over an insertion-ordered dict.
+
+        present = np.isfinite(rank)
+        masked = np.where(present, votes, -np.inf)
+        best = masked.max(axis=1, keepdims=True)
+        tied_rank = np.where(present & (masked == best), rank, np.inf)
+
+        return np.argmin(tied_rank, axis=1)
+
+    def generate_design_batch(self,
+                              seismic,
+                              flood,
+                              heatwave,
+                              landslide,
+                              soil_type,
+                              elevation,
+                              rainfall,
+                              temperature):
+
+        # Columnar generate_design: each argument is an array with one
+        # entry per site. Votes live in (sites x recommendations) matrices
+        # per design part and are accumulated layer by layer in the same
+        # order as the single-site path.
+
+        hazard_matrix = np.column_stack([
+            np.asarray(seismic, dtype=float),
+            np.asarray(flood, dtype=float),
+            np.asarray(heatwave, dtype=float),
+            np.asarray(landslide, dtype=float),
+        ])
+
+        elevation = np.asarray(elevation, dtype=float)
+        rainfall = np.asarray(rainfall, dtype=float)
+        temperature = np.asarray(temperature, dtype=float)
+
+        n = len(hazard_matrix)
+        rows = np.arange(n)
+
+        scores = {part: np.zeros(n) for part in DESIGN_PARTS}
+        votes = {part: np.zeros((n, len(self._vocab[part]))) for part in DESIGN_PARTS}
+        rank = {part: np.full((n, len(self._vocab[part])), np.inf) for part in DESIGN_PARTS}
+        slot = 0
+
+        # ---------------------------
+        # Hazard Voting (Core Layer)
+        # ---------------------------
+
+        for h, hazard in enumerate(HAZARDS):
+
+            rule = self.hazard_table.get(hazard)
+
+            if rule is None:
+                continue
+
+            for part in DESIGN_PARTS:
+                weight = hazard_matrix[:, h] * rule[f"{part}_Weight"]
+                col = self._vocab_index[part][rule[f"{part}_Recommendation"]]
+
+                scores[part] += weight
+                votes[part][:, col] += weight
+                rank[part][:, col] = np.minimum(rank[part][:, col], slot)
+
+            slot += 1
+
+        hazard_choice = {
+            part: self._vocab[part][self._vote_winner(votes[part], rank[part])]
+            for part in DESIGN_PARTS
+        }
+
+        # ---------------------------
+        # Soil Influence Layer
+        # ---------------------------
+
+        soil_idx = self._soil_types.get_indexer(np.asarray(soil_type, dtype=object))
+        has_soil = soil_idx >= 0
+
+        for part in ["Structural", "Foundation"]:
+            # Missing soil types map to a 1.0 weight and no vote
+            scores[part] = scores[part] * self._soil_weight[part][soil_idx]
+
+            col = self._soil_rec[part][soil_idx]
+            hit = rows[has_soil]
+
+            votes[part][hit, col[has_soil]] += scores[part][has_soil] * 0.3
+            rank[part][hit, col[has_soil]] = np.minimum(
+                rank[part][hit, col[has_soil]], slot
+            )
+
+        slot += 1
+
+        # ---------------------------
+        # Climate Categorization Layer
+        # ---------------------------
+
+        levels = {
+            "Elevation": np.where(elevation > 1500, "High",
+                         np.where(elevation > 500, "Mid", "Low")),
+            "Precipitation": np.where(rainfall > 2500, "High",
+                             np.where(rainfall > 1000, "Mid", "Low")),
+            "Weather": np.where(temperature > 32, "Hot",
+                       np.where(temperature < 12, "Cold", "Moderate")),
+        }
+
+        climate_factor = 0.35
+
+        for category in CLIMATE_CATEGORIES:
+
+            for level in np.unique(levels[category]):
+
+                rule = self.climate_table.get((category, level))
+
+                if rule is None:
+                    continue
+
+                hit = rows[levels[category] == level]
+
+                for part in DESIGN_PARTS:
+                    weight = rule[f"{part}_Weight"] * climate_factor
+                    col = self._vocab_index[part][rule[f"{part}_Recommendation"]]
+
+                    scores[part][hit] += weight
+                    votes[part][hit, col] += weight
+                    rank[part][hit, col] = np.minimum(rank[part][hit, col], slot)
+
+            slot += 1
+
+        # ---------------------------
+        # Final Integrated Selection
+        # ---------------------------
+
+        final_choice = {
+            part: self._vocab[part][self._vote_winner(votes[part], rank[part])]
+            for part in DESIGN_PARTS
+        }
+
+        hazard_dominance = np.array(HAZARDS, dtype=object)[
+            np.argmax(hazard_matrix, axis=1)
+        ]
+
+        total_score = (
+            scores["Structural"]
+            + scores["Foundation"]
+            + scores["Roof"]
+            + scores["Window"]
+        ) / 4
+
+        # np.round scales by 1000 before rounding, which can carry a value
+        # just below a half-way point up; round() in generate_design is
+        # exact, so the few near-ties are rounded the same way here
+        strength = np.round(total_score, 3)
+        scaled = total_score * 1000
+        near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+        strength[near_tie] = [round(float(x), 3) for x in total_score[near_tie]]
+
+        return {
+            "Primary_Hazard_Driver": hazard_dominance,
+            "Hazard_Driven_Design": hazard_choice,
+            "Final_Integrated_Design": final_choice,
+            "Design_Strength_Index": strength,
+        }
@@ -1,5 +1,10 @@
 import numpy as np
-from aitechture.data_pipeline.spatial_aggregation import aggregate_spatial_risk
+from aitechture.data_pipeline.preprocessing import percentile
+from aitechture.data_pipeline.spatial_aggregation import (
+    EventCatalogue,
+    aggregate_catalogue_risk,
+    build_seismic_field,
+)
 
 
 # ----------------------------
@@ -10,39 +15,102 @@ def smooth_compress(x, factor=0.3):
     return x / (1 + factor * x)
 
 
-def percentile(value, distribution):
-    return np.sum(distribution <= value) / len(distribution)
+# ----------------------------
+# Regions
+# ----------------------------
+
+# Written with & / | so they work on scalars and on coordinate arrays.
+
+def _himalayan_ne(lat, lon):
+    return (lat > 30) | ((lat > 26) & (lon > 85))
+
+
+def _desert_belt(lat, lon):
+    return (23 <= lat) & (lat <= 29) & (lon < 75)
+
+
+def _western_ghats(lat, lon):
+    return (8 <= lat) & (lat <= 20) & (72 <= lon) & (lon <= 76)
+
+
+def _west_coast_lon(lat):
+    # West coast shifts from ~73E (north) to ~76.5E (south) with smooth curvature
+    return 73 + ((30 - lat) / 22) * 3.5 + 0.01 * (30 - lat)**2
+
+
+def _east_coast_lon(lat):
+    # East coast shifts from ~88E (north) to ~78.5E (south) with smooth curvature
+    return 88 - ((30 - lat) / 22) * 9.5 - 0.008 * (30 - lat)**2
 
 
 # ----------------------------
 # Seismic
 # ----------------------------
 
-def seismic_risk(lat, lon, earthquake_df, seismic_distribution):
+def seismic_risk(lat,
+                 lon,
+                 earthquakes,
+                 seismic_distribution,
+                 earthquake_index=None,
+                 radius_km=300,
+                 log_field=None,
+                 kernel=None):
 
-    seismic_values = (
-        earthquake_df["Energy_Index"].values
-        * earthquake_df["Depth_Factor"].values
-    )
+    # earthquakes is the engine's EventCatalogue; a raw earthquake frame
+    # is still accepted and converted on the fly. log_field, when given,
+    # is a precomputed log1p(aggregated contribution) for this site.
 
-    temp_df = earthquake_df.copy()
-    temp_df["Seismic_Contribution"] = seismic_values
+    if log_field is None:
+        if not isinstance(earthquakes, EventCatalogue):
+            earthquakes = EventCatalogue.from_earthquakes(earthquakes)
 
-    raw = aggregate_spatial_risk(
-        lat, lon, temp_df, "Seismic_Contribution"
-    )
+        raw = aggregate_catalogue_risk(
+            lat,
+            lon,
+            earthquakes,
+            radius_km=radius_km,
+            index=earthquake_index,
+            kernel=kernel
+        )
 
-    raw = np.log1p(raw)
+        log_field = np.log1p(raw)
 
-    base = percentile(raw, seismic_distribution)
+    base = percentile(log_field, seismic_distribution)
 
     # Himalayan & NE boost
-    if lat > 30 or (lat > 26 and lon > 85):
+    if _himalayan_ne(lat, lon):
         base *= 1.1
 
     return smooth_compress(base)
 
 
+def seismic_risk_batch(lats,
+                       lons,
+                       earthquakes,
+                       seismic_distribution,
+                       earthquake_index=None,
+                       radius_km=300,
+                       log_field=None,
+                       kernel=None):
+
+    if log_field is None:
+        log_field = np.log1p(build_seismic_field(
+            lats,
+            lons,
+            earthquakes,
+            radius_km=radius_km,
+            index=earthquake_index,
+            kernel=kernel
+        ))
+
+    base = percentile(log_field, seismic_distribution)
+
+    # Himalayan & NE boost
+    base = np.where(_himalayan_ne(lats, lons), base * 1.1, base)
+
+    return smooth_compress(base)
+
+
 # ----------------------------
 # Heatwave
 # ----------------------------
@@ -57,7 +125,7 @@ def heatwave_risk(lat, lon, local_row, heat_distribution):
     base = percentile(heat_raw, heat_distribution)
 
     # Desert boost
-    if 23 <= lat <= 29 and lon < 75:
+    if _desert_belt(lat, lon):
         base *= 1.15
 
     # Himalayan cooling
@@ -67,6 +135,24 @@ def heatwave_risk(lat, lon, local_row, heat_distribution):
     return smooth_compress(base)
 
 
+def heatwave_risk_batch(lats, lons, local_rows, heat_distribution):
+
+    heat_raw = (
+        local_rows["Temperature_C"].values
+        + 0.33 * local_rows["Humidity_pct"].values
+    )
+
+    base = percentile(heat_raw, heat_distribution)
+
+    # Desert boost
+    base = np.where(_desert_belt(lats, lons), base * 1.15, base)
+
+    # Himalayan cooling
+    base = np.where(lats > 30, base * 0.6, base)
+
+    return smooth_compress(base)
+
+
 # ----------------------------
 # Flood
 # ----------------------------
@@ -102,21 +188,19 @@ def flood_risk(lat, lon, local_row, flood_distribution):
         base = min(base, 0.25)
 
     # 2️⃣ Desert belt suppression (Rajasthan)
-    if 23 <= lat <= 29 and lon < 75:
+    if _desert_belt(lat, lon):
         base *= 0.5
 
     # Clamp latitude to Indian mainland bounds
     lat = max(8, min(lat, 30))
 
     # 3️⃣ Dynamic West Coast Proximity
-    # West coast shifts from ~73E (north) to ~76.5E (south) with smooth curvature
-    west_coast_lon = 73 + ((30 - lat) / 22) * 3.5 + 0.01 * (30 - lat)**2
+    west_coast_lon = _west_coast_lon(lat)
     if lon <= west_coast_lon + 0.7:
         base *= 2.5
 
     # 4️⃣ Dynamic East Coast Proximity
-    # East coast shifts from ~88E (north) to ~78.5E (south) with smooth curvature
-    east_coast_lon = 88 - ((30 - lat) / 22) * 9.5 - 0.008 * (30 - lat)**2
+    east_coast_lon = _east_coast_lon(lat)
     if lon >= east_coast_lon - 0.7:
         base *= 1.5
 
@@ -127,25 +211,83 @@ def flood_risk(lat, lon, local_row, flood_distribution):
     return base
 
 
+def flood_risk_batch(lats, lons, local_rows, flood_distribution):
+
+    rain = local_rows["Rainfall_mm"].values
+    discharge = local_rows["River_Discharge"].values
+    water = local_rows["Water_Level"].values
+    elevation = local_rows["Elevation_m"].values
+
+    # Base physics
+    raw = (rain * water * np.log1p(discharge)) / (elevation + 100)
+
+    base = percentile(raw, flood_distribution)
+
+    # 1️⃣ High elevation clamp (mountain regions)
+    base = np.where(elevation > 1500, np.minimum(base, 0.25), base)
+
+    # 2️⃣ Desert belt suppression (Rajasthan)
+    base = np.where(_desert_belt(lats, lons), base * 0.5, base)
+
+    # Clamp latitude to Indian mainland bounds
+    lats = np.clip(lats, 8, 30)
+
+    # 3️⃣ Dynamic West Coast Proximity
+    west_coast_lon = _west_coast_lon(lats)
+    base = np.where(lons <= west_coast_lon + 0.7, base * 2.5, base)
+
+    # 4️⃣ Dynamic East Coast Proximity
+    east_coast_lon = _east_coast_lon(lats)
+    base = np.where(lons >= east_coast_lon - 0.7, base * 1.5, base)
+
+    # 5️⃣ Western Ghats enhancement
+    ghats = (8 <= lats) & (lats <= 20) & (np.abs(lons - west_coast_lon) < 1.0)
+    base = np.where(ghats, base * 1.2, base)
+
+    return base
+
+
 # ----------------------------
 # Landslide
 # ----------------------------
 
-def landslide_risk(lat, lon, landslide_df):
+def landslide_risk(lat, lon, landslide_df, landslide_index=None, position=None):
 
-    idx = (
-        (landslide_df["Latitude"] - lat) ** 2
-        + (landslide_df["Longitude"] - lon) ** 2
-    ).idxmin()
+    if position is not None:
+        base = landslide_df["Base_Landslide_Risk"].values[position]
+    elif landslide_index is not None:
+        position = landslide_index.nearest(lat, lon)[0][0]
+        base = landslide_df["Base_Landslide_Risk"].values[position]
+    else:
+        idx = (
+            (landslide_df["Latitude"] - lat) ** 2
+            + (landslide_df["Longitude"] - lon) ** 2
+        ).idxmin()
 
-    base = landslide_df.loc[idx, "Base_Landslide_Risk"]
+        base = landslide_df.loc[idx, "Base_Landslide_Risk"]
 
     # Himalayan strong boost
-    if lat > 30 or (lat > 26 and lon > 85):
+    if _himalayan_ne(lat, lon):
         base *= 1.4
 
     # Western Ghats moderate boost
-    if 8 <= lat <= 20 and 72 <= lon <= 76:
+    if _western_ghats(lat, lon):
         base *= 1.2
 
+    return smooth_compress(base)
+
+
+def landslide_risk_batch(lats, lons, landslide_df, landslide_index, positions=None):
+
+    if positions is None:
+        positions = landslide_index.nearest_batch(lats, lons)[0][:, 0]
+
+    base = landslide_df["Base_Landslide_Risk"].values[positions]
+
+    # Himalayan strong boost
+    base = np.where(_himalayan_ne(lats, lons), base * 1.4, base)
+
+    # Western Ghats moderate boost
+    base = np.where(_western_ghats(lats, lons), base * 1.2, base)
+
     return smooth_compress(base)
\ No newline at end of file
@@ -0,0 +1,178 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+
+# Upper bounds (seconds) of the histogram buckets, 10 us to 10 s
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005,
+    0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0,
+)
+
+# Stage timings of the current request, when one is being collected
+_collected = ContextVar("aitechture_stage_timings", default=None)
+
+
+class Histogram:
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        slot = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[slot] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.sum, self.count
+
+
+class _NullStage:
+
+    # Shared do-nothing context returned while metrics are disabled
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+
+    __slots__ = ("registry", "name", "started")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class StageMetrics:
+
+    # Per-stage latency histograms. stage(name) times a `with` block and
+    # timed(name) a function; while disabled both cost one attribute
+    # check. Histograms are per process: under gunicorn each worker
+    # reports its own.
+
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(self.buckets))
+        return histogram
+
+    def observe(self, name, seconds):
+        self._histogram(name).observe(seconds)
+
+        collected = _collected.get()
+        if collected is not None:
+            collected.append((name, seconds))
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def timed(self, name):
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Stage(self, name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    # --------------------------------------------------
+    # Per-request collection (Server-Timing)
+    # --------------------------------------------------
+
+    @staticmethod
+    def start_collecting():
+        return _collected.set([])
+
+    @staticmethod
+    def stop_collecting(token):
+        collected = _collected.get()
+        _collected.reset(token)
+        return collected or []
+
+    # --------------------------------------------------
+    # Export
+    # --------------------------------------------------
+
+    def render_prometheus(self, metric="aitechture_stage_seconds"):
+
+        lines = [
+            f"# HELP {metric} Time spent in each engine, startup and rendering stage.",
+            f"# TYPE {metric} histogram",
+        ]
+
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+
+        for name, histogram in histograms:
+            counts, total, count = histogram.snapshot()
+
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{bound:g}"}} {cumulative}')
+
+            lines.append(f'{metric}_bucket{{stage="{name}",le="+Inf"}} {count}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {total!r}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+
+def server_timing_header(timings):
+    # Server-Timing value; repeated stages are summed, durations in ms
+    totals = {}
+    for name, seconds in timings:
+        totals[name] = totals.get(name, 0.0) + seconds
+    return ", ".join(f"{name};dur={seconds * 1000:.3f}" for name, seconds in totals.items())
+
+
+# Process-wide registry. AITECHTURE_METRICS=0 switches timing off.
+metrics = StageMetrics(enabled=os.environ.get("AITECHTURE_METRICS", "1") != "0")
+
+stage = metrics.stage
+timed = metrics.timed
@@ -1,22 +1,81 @@
 import numpy as np
 
+HAZARD_COLUMNS = [
+    "Res_Earthquake",
+    "Res_Flood",
+    "Res_Heatwave",
+    "Res_Cyclone",
+    "Res_Landslide",
+]
 
-def rank_materials(material_df, risk_vector):
 
-    hazard_cols = [
-        "Res_Earthquake",
-        "Res_Flood",
-        "Res_Heatwave",
-        "Res_Cyclone",
-        "Res_Landslide",
-    ]
+def _top_k(scores, k):
+
+    # Best k along the last axis, highest score first. Ties keep catalogue
+    # order, like sort_values(ascending=False) on the full frame.
+
+    k = min(k, scores.shape[-1])
+
+    if k < scores.shape[-1]:
+        candidates = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+        candidates = np.sort(candidates, axis=-1)
+    else:
+        candidates = np.broadcast_to(np.arange(k), scores.shape)
+
+    candidate_scores = np.take_along_axis(scores, candidates, axis=-1)
+    order = np.argsort(-candidate_scores, axis=-1, kind="stable")
+
+    return (
+        np.take_along_axis(candidates, order, axis=-1),
+        np.take_along_axis(candidate_scores, order, axis=-1),
+    )
+
+
+class MaterialRanker:
+
+    # Caches the Res_* resilience matrix once; rankings are computed on
+    # arrays and only turned into a DataFrame by frame().
+
+    def __init__(self, material_df):
+        self.materials = material_df
+        self.matrix = np.ascontiguousarray(
+            material_df[HAZARD_COLUMNS].values.astype(float)
+        )
+        self.names = material_df["Material"].values
+
+    def scores(self, risk_vector):
+        return self.matrix @ np.asarray(risk_vector, dtype=float)
+
+    def top_k(self, risk_vector, k=5):
+        return _top_k(self.scores(risk_vector), k)
+
+    def top_k_batch(self, risk_matrix, k=5):
+        # One (N x 5) @ (5 x materials) matrix product for the whole batch
+        scores = np.asarray(risk_matrix, dtype=float) @ self.matrix.T
+        return _top_k(scores, k)
+
+    def frame(self, positions, scores):
+        ranked = self.materials.iloc[positions].copy()
+        ranked["Suitability_Score"] = scores
+        return ranked
+
+
+def rank_materials(material_df, risk_vector):
 
     materials = material_df.copy()
 
-    material_matrix = materials[hazard_cols].values.astype(float)
+    material_matrix = materials[HAZARD_COLUMNS].values.astype(float)
 
     scores = material_matrix @ risk_vector
 
     materials["Suitability_Score"] = scores
 
-    return materials.sort_values("Suitability_Score", ascending=False)
\ No newline at end of file
+    return materials.sort_values("Suitability_Score", ascending=False)
+
+
+def rank_materials_batch(material_df, risk_matrix, k=5):
+
+    # risk_matrix is N x 5; returns the row positions of the top-k
+    # materials per site and their suitability scores, best first.
+
+    return MaterialRanker(material_df).top_k_batch(risk_matrix, k)
@@ -0,0 +1,115 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def _estimate_size(value):
+
+    # Rough deep size of an evaluate() result, used for the memory bound
+
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            _estimate_size(k) + _estimate_size(v) for k, v in value.items()
+        )
+
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+
+    # LRU cache of evaluate() results keyed on coordinates rounded to
+    # `precision` decimals (3 decimals is roughly 110 m). Bounded both by
+    # entry count and by estimated memory. Cached results are shared
+    # between callers and must be treated as read-only.
+
+    def __init__(self, max_entries=10_000, max_bytes=64 * 1024 * 1024, precision=3):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.precision = precision
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._token = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # --------------------------------------------------
+    # Keys & Invalidation
+    # --------------------------------------------------
+
+    def quantize(self, lat, lon):
+        return round(float(lat), self.precision), round(float(lon), self.precision)
+
+    def bind(self, token):
+        # Called with the engine's data/parameter fingerprint; results
+        # computed against any other state are dropped.
+        with self._lock:
+            if token != self._token:
+                self._entries.clear()
+                self._bytes = 0
+                self._token = token
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # --------------------------------------------------
+    # Lookup
+    # --------------------------------------------------
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, result, token=None):
+
+        # `token` is the fingerprint the result was computed under; if the
+        # cache has been rebound since, the result is stale and dropped.
+
+        size = _estimate_size(result)
+
+        with self._lock:
+            if token is not None and token != self._token:
+                return
+
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+
+            self._entries[key] = (result, size)
+            self._bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or self._bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "precision": self.precision,
+            }
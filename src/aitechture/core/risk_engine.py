@@ -1,126 +1,811 @@
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import version
+from pathlib import Path
+
 import numpy as np
+import pandas as pd
 
-from aitechture.data_pipeline.data_loader import *
-from aitechture.data_pipeline.preprocessing import *
-from aitechture.core.climate_zoning import ClimateZoning
-from aitechture.core.hazard_models import *
-from aitechture.core.material_optimizer import *
+from aitechture.core.climate_zoning import ZoneModel
 from aitechture.core.design_engine import DesignEngine
+from aitechture.core.hazard_models import (
+    flood_raw_score,
+    flood_risk,
+    flood_risk_batch,
+    heatwave_risk,
+    heatwave_risk_batch,
+    landslide_risk,
+    landslide_risk_batch,
+    seismic_risk,
+    seismic_risk_batch,
+)
+from aitechture.core.hazard_raster import HazardRaster
+from aitechture.core.instrumentation import metrics, stage, timed
+from aitechture.core.material_optimizer import MaterialRanker
+from aitechture.data_pipeline.artifact_store import (
+    ArtifactStore,
+    dataset_fingerprint,
+    extend_fingerprint,
+    parameter_fingerprint,
+)
+from aitechture.data_pipeline.attenuation import resolve_kernel
+from aitechture.data_pipeline.data_loader import (
+    DATA_DIR,
+    EARTHQUAKE_REQUIRED_COLUMNS,
+    clean_earthquakes,
+    load_compiled,
+    load_earthquake,
+    load_landslide,
+    load_materials,
+)
+from aitechture.data_pipeline.gridded_aggregation import build_gridded_field
+from aitechture.data_pipeline.parallel import build_seismic_field_parallel
+from aitechture.data_pipeline.preprocessing import (
+    CLIMATE_ZONING_FEATURES,
+    ENGINE_COLUMNS,
+    build_climate_zoning_features,
+    compact_frame,
+)
+from aitechture.data_pipeline.spatial_aggregation import (
+    DEFAULT_MAX_CHUNK_BYTES,
+    EventCatalogue,
+    build_seismic_field,
+    scatter_catalogue_risk,
+)
+from aitechture.data_pipeline.spatial_index import SpatialIndex
+
+
+def _read_only(*arrays):
+    # Engine arrays are shared by every serving thread; an in-place write
+    # would be a data race, so it should fail instead
+    for array in arrays:
+        array.flags.writeable = False
+
+
+# Rows per chunk when zoning_method="streaming"
+STREAMING_ZONING_CHUNK_ROWS = 100_000
+
+
+class SeismicState:
+
+    # Everything seismic scoring reads, published as one object: a
+    # concurrent evaluate() holds either the old or the new state, never a
+    # mix of catalogue, index and distribution from two versions.
+
+    def __init__(self, earthquake, catalogue, index, field, grid=None, approximation=None):
+        self.earthquake = earthquake
+        self.catalogue = catalogue
+        self.index = index
+
+        # GriddedField used instead of the exact sum for new sites when the
+        # engine runs with a seismic_error_budget; None for exact scoring
+        self.grid = grid
+
+        # The grid's report, also kept when the grid missed its budget and
+        # was dropped ("fallback": "exact"); None without a budget
+        self.approximation = approximation
+
+        # Raw attenuated sum per compiled point, kept for additive updates
+        self.field = field
+
+        # Sorted: percentile ranking only depends on the values, and sorted
+        # arrays allow binary search
+        self.distribution = np.sort(np.log1p(field))
+
+        _read_only(self.field, self.distribution, *catalogue.arrays())
+
+        if grid is not None:
+            _read_only(grid.grid)
+
+    def log_field_batch(self, lats, lons, kernel, max_chunk_bytes=DEFAULT_MAX_CHUNK_BYTES):
+        if self.grid is not None:
+            field = self.grid.evaluate(lats, lons, self.catalogue, self.index)
+        else:
+            field = build_seismic_field(
+                lats,
+                lons,
+                self.catalogue,
+                max_chunk_bytes=max_chunk_bytes,
+                index=self.index,
+                kernel=kernel
+            )
+        return np.log1p(field)
 
 
 class RiskEngine:
 
-    def __init__(self):
+    # After __init__ the engine is read-only: evaluate(), evaluate_many()
+    # and evaluate_concurrent() have no side effects on it apart from the
+    # lazily fitted zoning and the (locked) result cache, and every
+    # precomputed array is flagged read-only. add_earthquakes() is the
+    # only writer and swaps whole objects rather than mutating them.
 
-        self.compiled = load_compiled()
-        self.earthquake = load_earthquake()
-        self.landslide = load_landslide()
-        self.materials = load_materials()
+    def __init__(self,
+                 max_chunk_bytes=DEFAULT_MAX_CHUNK_BYTES,
+                 cache_dir=None,
+                 n_clusters=5,
+                 radius_km=300,
+                 kernel="cauchy",
+                 result_cache=None,
+                 raster_dir=None,
+                 workers=1,
+                 zone_distributions=False,
+                 zoning_method="kmeans",
+                 seismic_error_budget=None,
+                 float32=False):
+
+        started = time.perf_counter()
+
+        self.n_clusters = n_clusters
+
+        # Seismic attenuation: a registry name (built with radius_km as its
+        # cutoff) or an AttenuationKernel; see attenuation.py
+        self.kernel = resolve_kernel(kernel, radius_km)
+        self.radius_km = self.kernel.support_km
+
+        # Processes used for the seismic field precompute; the result does
+        # not depend on it
+        self.workers = workers
+
+        # Rank flood and heat scores against the site's own climate zone
+        # instead of the whole dataset
+        self.zone_distributions = zone_distributions
+
+        # "kmeans" (full batch) or "streaming" (mini-batch over chunks,
+        # stable zone IDs); see climate_zoning.py
+        if zoning_method not in ("kmeans", "streaming"):
+            raise ValueError(f"Unknown zoning_method: {zoning_method!r}")
+        self.zoning_method = zoning_method
+
+        # Store compiled and landslide coordinates as float32 (see
+        # compact_frame). Indexes and the seismic field are still built
+        # from float64 coordinates, so no score changes.
+        self.float32 = float32
+
+        # When set, seismic fields come from an FFT-gridded approximation
+        # (see gridded_aggregation.py) whose 99th percentile log1p error on
+        # compiled points is held within this budget; None sums exactly
+        self.seismic_error_budget = seismic_error_budget
+        if seismic_error_budget is not None and self.kernel.per_event:
+            raise ValueError(
+                f"seismic_error_budget needs a kernel with one cutoff for all "
+                f"events, not {self.kernel.name!r}"
+            )
 
-        
         self.design_engine = DesignEngine()
 
-        # ---- Climate Zoning ----
-        zoning_features = build_climate_zoning_features(self.compiled)
-        self.zoning = ClimateZoning(n_clusters=5)
-        self.zones = self.zoning.fit(zoning_features)
+        # Climate zoning is fitted on first access (see `zoning`), unless
+        # the zone model comes from the artifact cache
+        self._zoning = None
+        self._zone_model = None
+        self._zones = None
+        self._zoning_lock = threading.Lock()
 
-        # --------------------------------------------------
-        # Precompute Seismic Distribution
-        # --------------------------------------------------
+        # Serialises add_earthquakes(); readers never take it
+        self._update_lock = threading.Lock()
+
+        # Identifies the input data + parameters behind every artifact,
+        # raster and cached result. data_fingerprint leaves out the seismic
+        # kernel, so engines that differ only in kernel share artifacts.
+        with stage("startup.fingerprint"):
+            self.data_fingerprint = dataset_fingerprint(DATA_DIR, self.parameters())
+            self.fingerprint = parameter_fingerprint(
+                self.data_fingerprint, self.seismic_parameters()
+            )
+
+        # ---- Precomputed Artifact Cache ----
+        # Shared artifacts under <cache_dir>/<data_fingerprint>, the seismic
+        # field per kernel under <cache_dir>/seismic/<fingerprint>. A new
+        # kernel over cached data only recomputes its field ("partial").
+        self.cache_status = "disabled"
+        store = seismic_store = None
+
+        if cache_dir is not None:
+            store = ArtifactStore(cache_dir, self.data_fingerprint)
+            seismic_store = ArtifactStore(Path(cache_dir) / "seismic", self.fingerprint)
+
+        if store is not None and store.exists():
+            with stage("startup.load_artifacts"):
+                self.cache_status = self._load_artifacts(store, seismic_store, max_chunk_bytes)
+        else:
+            self._build_artifacts(max_chunk_bytes)
+
+            if store is not None:
+                with stage("startup.save_artifacts"):
+                    self._save_artifacts(store)
+                    self._save_seismic(seismic_store)
+                self.cache_status = "miss"
+
+        # ---- Opt-in Raster Mode ----
+        self.raster = None
+        if raster_dir is not None:
+            with stage("startup.raster"):
+                raster = HazardRaster.load(raster_dir)
+
+            if raster.fingerprint == self.fingerprint:
+                self.raster = raster
+            else:
+                warnings.warn(
+                    f"Ignoring hazard raster in {raster_dir}: it was built "
+                    "from different data or engine parameters"
+                )
+
+        # ---- Opt-in Result Cache ----
+        self.result_cache = result_cache
+        if result_cache is not None:
+            result_cache.bind(self.fingerprint)
+
+        self._freeze()
+
+        self.startup_seconds = time.perf_counter() - started
+
+        if metrics.enabled:
+            metrics.observe("startup", self.startup_seconds)
+
+    # ------------------------------------------------------
+
+    def parameters(self):
+        # Everything that changes the precomputed artifacts, apart from the
+        # seismic field (see seismic_parameters)
+        return {
+            "n_clusters": self.n_clusters,
+            "zone_distributions": self.zone_distributions,
+            "zoning_method": self.zoning_method,
+            "float32": self.float32,
+            "numpy": np.__version__,
+            # Read from package metadata so scikit-learn is not imported
+            "sklearn": version("scikit-learn"),
+        }
+
+    def seismic_parameters(self):
+        # Everything that changes the seismic field on top of parameters()
+        return {
+            "kernel": self.kernel.spec(),
+            "seismic_error_budget": self.seismic_error_budget,
+        }
+
+    # ------------------------------------------------------
+    # Climate Zoning (lazy)
+    # ------------------------------------------------------
+
+    @property
+    def zoning(self):
+        self._fit_zoning()
+        return self._zoning
+
+    @property
+    def zone_model(self):
+        if self._zone_model is None:
+            self._fit_zoning()
+        return self._zone_model
+
+    @property
+    def zones(self):
+
+        # Zone of every compiled point. Computed from the zone model when
+        # that was loaded rather than fitted; both give the KMeans labels.
+
+        if self._zones is None:
+            zones = self.zone_model.assign_batch(
+                build_climate_zoning_features(self.compiled)
+            )
+            _read_only(zones)
+            self._zones = zones
+
+        return self._zones
+
+    def _fit_zoning(self):
+
+        # KMeans and StandardScaler are only imported and fitted when
+        # zoning is first requested and no cached zone model exists.
+
+        if self._zoning is not None:
+            return
+
+        with self._zoning_lock:
+            if self._zoning is not None:
+                return
+
+            from aitechture.core.climate_zoning import (
+                ClimateZoning,
+                StreamingClimateZoning,
+            )
+
+            zones = None
+
+            if self.zoning_method == "streaming":
+                compiled = self.compiled
 
-        self.seismic_distribution = []
+                def chunks(rows=STREAMING_ZONING_CHUNK_ROWS):
+                    for start in range(0, len(compiled), rows):
+                        yield compiled.iloc[start:start + rows][CLIMATE_ZONING_FEATURES]
 
-        seismic_values = (
-            self.earthquake["Energy_Index"].values
-            * self.earthquake["Depth_Factor"].values
+                zoning = StreamingClimateZoning(n_clusters=self.n_clusters).fit(chunks)
+            else:
+                zoning = ClimateZoning(n_clusters=self.n_clusters)
+                zones = zoning.fit(build_climate_zoning_features(self.compiled))
+                _read_only(zones)
+
+            if self._zone_model is None:
+                self._zone_model = zoning.zone_model()
+                self._zones = zones
+
+            self._zoning = zoning
+
+    # ---- Per-site zone lookup ----
+
+    def climate_zone(self, lat, lon):
+        # Zone of the nearest compiled point
+        return int(self.zones[self._nearest_position(lat, lon, self.raster)])
+
+    def climate_zone_batch(self, lats, lons):
+
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+
+        raster = self.raster
+        positions = np.empty(len(lats), dtype=np.intp)
+
+        inside = np.zeros(len(lats), dtype=bool)
+        if raster is not None:
+            inside = raster.contains(lats, lons)
+
+        if inside.any():
+            positions[inside] = raster.compiled_position_at(lats[inside], lons[inside])
+
+        outside = ~inside
+        if outside.any():
+            positions[outside] = self.compiled_index.nearest_batch(
+                lats[outside], lons[outside]
+            )[0][:, 0]
+
+        return self.zones[positions]
+
+    # ------------------------------------------------------
+
+    # Seismic state (see SeismicState / add_earthquakes)
+
+    @property
+    def earthquake(self):
+        return self.seismic.earthquake
+
+    @property
+    def earthquake_catalogue(self):
+        return self.seismic.catalogue
+
+    @property
+    def earthquake_index(self):
+        return self.seismic.index
+
+    @property
+    def seismic_field(self):
+        return self.seismic.field
+
+    @property
+    def seismic_distribution(self):
+        return self.seismic.distribution
+
+    @property
+    def seismic_approximation(self):
+        # Settings and measured error of the seismic grid, whether or not
+        # it met the budget; None when no budget is set
+        return self.seismic.approximation
+
+    # ------------------------------------------------------
+    # Memory
+    # ------------------------------------------------------
+
+    def memory_usage(self):
+
+        # Bytes held per component, largest first. Frames are measured
+        # deep; artifacts memory-mapped from the cache are counted too,
+        # although their pages are shared between processes.
+
+        seismic = self.seismic
+
+        usage = {
+            name: int(getattr(self, name).memory_usage(deep=True).sum())
+            for name in ["compiled", "landslide", "materials"]
+        }
+        usage["earthquake"] = int(seismic.earthquake.memory_usage(deep=True).sum())
+
+        usage["compiled_index"] = self.compiled_index.nbytes
+        usage["earthquake_index"] = seismic.index.nbytes
+        usage["landslide_index"] = self.landslide_index.nbytes
+
+        usage["earthquake_catalogue"] = seismic.catalogue.nbytes
+        usage["seismic_field"] = seismic.field.nbytes + seismic.distribution.nbytes
+        if seismic.grid is not None:
+            usage["seismic_grid"] = seismic.grid.nbytes
+
+        usage["heat_flood_distributions"] = (
+            self.heat_distribution.nbytes + self.flood_distribution.nbytes
         )
+        if self.zone_distributions:
+            usage["zone_distributions"] = sum(
+                array.nbytes
+                for array in self.heat_distribution_by_zone + self.flood_distribution_by_zone
+            )
+
+        usage["material_ranker"] = self.material_ranker.matrix.nbytes
+        if self._zones is not None:
+            usage["zones"] = self._zones.nbytes
+        if self.raster is not None:
+            usage["raster"] = self.raster.nbytes
 
-        temp_df = self.earthquake.copy()
-        temp_df["Seismic_Contribution"] = seismic_values
+        return dict(sorted(usage.items(), key=lambda item: -item[1]))
 
-        for _, row in self.compiled.iterrows():
+    # ------------------------------------------------------
+
+    def _freeze(self):
+
+        _read_only(
+            self.heat_distribution,
+            self.flood_distribution,
+            self.material_ranker.matrix
+        )
 
-            raw = aggregate_spatial_risk(
-                row["Latitude"],
-                row["Longitude"],
-                temp_df,
-                "Seismic_Contribution"
+        if self.zone_distributions:
+            _read_only(*self.heat_distribution_by_zone, *self.flood_distribution_by_zone)
+
+        if self.raster is not None:
+            _read_only(
+                self.raster.seismic_log,
+                self.raster.compiled_position,
+                self.raster.landslide_position
             )
 
-            self.seismic_distribution.append(np.log1p(raw))
+    def _derive_arrays(self):
+
+        # Array views over the loaded frames, built once per process
+
+        # Res_* resilience matrix for top-k material ranking
+        self.material_ranker = MaterialRanker(self.materials)
+
+    def _build_artifacts(self, max_chunk_bytes):
 
-        self.seismic_distribution = np.array(self.seismic_distribution)
+        with stage("startup.load_data"):
+            # Only the columns some model reads, text as integer codes
+            self.compiled = compact_frame(load_compiled(columns=ENGINE_COLUMNS["compiled"]))
+            # Events stay float64: rounding would move them across the
+            # kernel cutoff, and the catalogue holds float64 copies anyway
+            earthquake = compact_frame(load_earthquake(columns=ENGINE_COLUMNS["earthquake"]))
+            self.landslide = compact_frame(load_landslide(columns=ENGINE_COLUMNS["landslide"]))
+            self.materials = load_materials()
+
+            self._derive_arrays()
+
+            # Earthquake contributions as contiguous arrays
+            earthquake_catalogue = EventCatalogue.from_earthquakes(earthquake)
+
+        # ---- Spatial Indexes (built once per dataset) ----
+        with stage("startup.spatial_indexes"):
+            self.compiled_index = SpatialIndex.from_frame(self.compiled)
+            earthquake_index = SpatialIndex.from_frame(earthquake)
+            self.landslide_index = SpatialIndex.from_frame(self.landslide)
+
+            # Narrowed only now that the indexes hold float64 coordinates
+            if self.float32:
+                self.compiled = compact_frame(self.compiled, float32=True)
+                self.landslide = compact_frame(self.landslide, float32=True)
 
         # --------------------------------------------------
-        # Precompute Heat Distribution
+        # Precompute Seismic Distribution
         # --------------------------------------------------
 
-        self.heat_distribution = []
+        with stage("startup.seismic_distribution"):
+            seismic_field, grid, approximation = self._compute_seismic_field(
+                earthquake_catalogue, earthquake_index, max_chunk_bytes
+            )
+
+            self.seismic = SeismicState(
+                earthquake, earthquake_catalogue, earthquake_index, seismic_field, grid, approximation
+            )
+
+        # --------------------------------------------------
+        # Precompute Heat Distribution
+        # --------------------------------------------------
 
-        for _, row in self.compiled.iterrows():
-            heat_raw = row["Temperature_C"] + 0.33 * row["Humidity_pct"]
-            self.heat_distribution.append(heat_raw)
+        heat_raw = (
+            self.compiled["Temperature_C"].values
+            + 0.33 * self.compiled["Humidity_pct"].values
+        )
 
-        self.heat_distribution = np.array(self.heat_distribution)
+        with stage("startup.heat_distribution"):
+            self.heat_distribution = np.sort(heat_raw)
 
         # --------------------------------------------------
         # Precompute Flood Distribution
         # --------------------------------------------------
 
-        self.flood_distribution = []
+        flood_raw = flood_raw_score(self.compiled).values
+
+        with stage("startup.flood_distribution"):
+            self.flood_distribution = np.sort(flood_raw)
+
+        # --------------------------------------------------
+        # Zone-Conditioned Distributions (opt-in)
+        # --------------------------------------------------
+
+        if self.zone_distributions:
+            with stage("startup.zone_distributions"):
+                zones = self.zones
+
+                self.heat_distribution_by_zone = [
+                    np.sort(heat_raw[zones == zone]) for zone in range(self.n_clusters)
+                ]
+                self.flood_distribution_by_zone = [
+                    np.sort(flood_raw[zones == zone]) for zone in range(self.n_clusters)
+                ]
 
-        for _, row in self.compiled.iterrows():
-            raw = flood_raw_score(row)
-            self.flood_distribution.append(raw)
+    def _compute_seismic_field(self, catalogue, index, max_chunk_bytes, grid_settings=None):
+
+        # Seismic field at every compiled point, the GriddedField it came
+        # from when an error budget is set, and the grid's report. A grid
+        # that misses the budget even after refining is dropped for the
+        # exact sum; its report is kept, marked "fallback": "exact".
+
+        if self.float32:
+            lats, lons = self.compiled_index.coordinates()
+        else:
+            lats = self.compiled["Latitude"].values
+            lons = self.compiled["Longitude"].values
+
+        if self.seismic_error_budget is not None:
+            grid = build_gridded_field(
+                catalogue,
+                lats,
+                lons,
+                index=index,
+                error_budget=self.seismic_error_budget,
+                kernel=self.kernel,
+                **(grid_settings or {})
+            )
 
-        self.flood_distribution = np.array(self.flood_distribution)
+            if grid.report["within_budget"]:
+                approximation = {**grid.report, "fallback": None}
+                return grid.evaluate(lats, lons, catalogue, index), grid, approximation
+
+            warnings.warn(
+                f"Gridded seismic field misses the error budget "
+                f"({grid.report['p99_log_error']:.4f} > {self.seismic_error_budget}); "
+                "using exact aggregation"
+            )
+            approximation = {**grid.report, "fallback": "exact"}
+        else:
+            approximation = None
+
+        if self.workers == 1:
+            field = build_seismic_field(
+                lats,
+                lons,
+                catalogue,
+                max_chunk_bytes=max_chunk_bytes,
+                index=index,
+                kernel=self.kernel
+            )
+        else:
+            field = build_seismic_field_parallel(
+                lats,
+                lons,
+                catalogue,
+                workers=self.workers,
+                max_chunk_bytes=max_chunk_bytes,
+                kernel=self.kernel
+            )
+
+        return field, None, approximation
+
+    def _save_artifacts(self, store):
+
+        store.begin()
+
+        try:
+            for name in ["compiled", "earthquake", "landslide", "materials"]:
+                store.save_frame(name, getattr(self, name))
+
+            for name in ["compiled_index", "earthquake_index", "landslide_index"]:
+                store.save_object(name, getattr(self, name))
+
+            for name in ["heat_distribution", "flood_distribution"]:
+                store.save_array(name, getattr(self, name))
+
+            # Persisted so warm starts never import or refit KMeans
+            zone_model = self.zone_model
+            store.save_array("zone_mean", zone_model.mean)
+            store.save_array("zone_scale", zone_model.scale)
+            store.save_array("zone_centroids", zone_model.centroids)
+
+            if self.zone_distributions:
+                for zone in range(self.n_clusters):
+                    store.save_array(f"heat_distribution_zone{zone}", self.heat_distribution_by_zone[zone])
+                    store.save_array(f"flood_distribution_zone{zone}", self.flood_distribution_by_zone[zone])
+        except Exception:
+            store.abort()
+            raise
+
+        store.commit()
+
+    def _save_seismic(self, store):
+
+        store.begin()
+
+        try:
+            store.save_array("seismic_field", self.seismic_field)
+
+            if self.seismic_error_budget is not None:
+                store.save_object("seismic_grid", self.seismic.grid)
+                store.save_object("seismic_approximation", self.seismic.approximation)
+        except Exception:
+            store.abort()
+            raise
+
+        store.commit()
+
+    def _load_artifacts(self, store, seismic_store, max_chunk_bytes):
+
+        # Returns the cache status: "hit", or "partial" when this kernel's
+        # seismic field was not cached and had to be computed
+
+        for name in ["compiled", "landslide", "materials"]:
+            setattr(self, name, store.load_frame(name))
+
+        self._derive_arrays()
+
+        for name in ["compiled_index", "landslide_index"]:
+            setattr(self, name, store.load_object(name))
+
+        for name in ["heat_distribution", "flood_distribution"]:
+            setattr(self, name, store.load_array(name))
+
+        self._zone_model = ZoneModel(
+            store.load_array("zone_mean", mmap=False),
+            store.load_array("zone_scale", mmap=False),
+            store.load_array("zone_centroids", mmap=False)
+        )
+
+        if self.zone_distributions:
+            self.heat_distribution_by_zone = [
+                store.load_array(f"heat_distribution_zone{zone}") for zone in range(self.n_clusters)
+            ]
+            self.flood_distribution_by_zone = [
+                store.load_array(f"flood_distribution_zone{zone}") for zone in range(self.n_clusters)
+            ]
+
+        earthquake = store.load_frame("earthquake")
+        catalogue = EventCatalogue.from_earthquakes(earthquake)
+        index = store.load_object("earthquake_index")
+
+        if seismic_store.exists():
+            gridded = self.seismic_error_budget is not None
+            self.seismic = SeismicState(
+                earthquake,
+                catalogue,
+                index,
+                seismic_store.load_array("seismic_field"),
+                seismic_store.load_object("seismic_grid") if gridded else None,
+                seismic_store.load_object("seismic_approximation") if gridded else None
+            )
+            return "hit"
+
+        with stage("startup.seismic_distribution"):
+            field, grid, approximation = self._compute_seismic_field(catalogue, index, max_chunk_bytes)
+            self.seismic = SeismicState(earthquake, catalogue, index, field, grid, approximation)
+
+        self._save_seismic(seismic_store)
+        return "partial"
 
     # ------------------------------------------------------
 
     def _nearest_row(self, lat, lon):
-        idx = (
-            (self.compiled["Latitude"] - lat) ** 2
-            + (self.compiled["Longitude"] - lon) ** 2
-        ).idxmin()
-        return self.compiled.loc[idx]
+        position = self.compiled_index.nearest(lat, lon)[0][0]
+        return self.compiled.iloc[position]
+
+    def _nearest_position(self, lat, lon, raster=None):
+        if raster is not None and raster.contains(lat, lon):
+            return raster.compiled_position_at(lat, lon)
+        return self.compiled_index.nearest(lat, lon)[0][0]
 
     # ------------------------------------------------------
 
-    def evaluate(self, lat, lon):
+    @timed("evaluate")
+    def evaluate(self, lat, lon, top_k=5):
+
+        if self.result_cache is None:
+            return self._evaluate(lat, lon, top_k)
+
+        # Evaluated at the rounded coordinates, so a cached answer does
+        # not depend on which nearby query happened to arrive first.
+        lat, lon = self.result_cache.quantize(lat, lon)
+        key = (lat, lon, top_k)
+
+        result = self.result_cache.get(key)
+
+        if result is None:
+            # Read before the state: add_earthquakes() publishes the new
+            # state first, so a result is never stored under a newer token
+            # than the data it was computed from.
+            token = self.fingerprint
+            result = self._evaluate(lat, lon, top_k)
+            self.result_cache.put(key, result, token=token)
+
+        return result
+
+    def _evaluate(self, lat, lon, top_k):
 
-        local_row = self._nearest_row(lat, lon)
+        # Raster mode: nearest rows and the seismic field come from the
+        # precomputed grid instead of spatial queries
+        seismic_log = None
+        landslide_position = None
+
+        # One snapshot per call, so a concurrent add_earthquakes() cannot
+        # change the data halfway through
+        seismic = self.seismic
+        raster = self.raster
+
+        with stage("evaluate.site_lookup"):
+            if raster is not None and raster.contains(lat, lon):
+                position = raster.compiled_position_at(lat, lon)
+                seismic_log = raster.seismic_log_at(lat, lon)
+                landslide_position = raster.landslide_position_at(lat, lon)
+            else:
+                position = self.compiled_index.nearest(lat, lon)[0][0]
+
+            local_row = self.compiled.iloc[position]
+
+        flood_distribution = self.flood_distribution
+        heat_distribution = self.heat_distribution
+
+        if self.zone_distributions:
+            zone = self.zones[position]
+            flood_distribution = self.flood_distribution_by_zone[zone]
+            heat_distribution = self.heat_distribution_by_zone[zone]
 
         # ---- Seismic ----
-        s_risk = seismic_risk(
-            lat,
-            lon,
-            self.earthquake,
-            self.seismic_distribution
-        )
+        with stage("evaluate.seismic"):
+            if seismic_log is None and seismic.grid is not None:
+                seismic_log = seismic.log_field_batch([lat], [lon], self.kernel)[0]
+
+            s_risk = seismic_risk(
+                lat,
+                lon,
+                seismic.catalogue,
+                seismic.distribution,
+                earthquake_index=seismic.index,
+                log_field=seismic_log,
+                kernel=self.kernel
+            )
 
         # ---- Flood ----
-        f_risk = flood_risk(
-            lat,
-            lon,
-            local_row,
-            self.flood_distribution
-        )
+        with stage("evaluate.flood"):
+            f_risk = flood_risk(
+                lat,
+                lon,
+                local_row,
+                flood_distribution
+            )
 
         # ---- Heatwave ----
-        h_risk = heatwave_risk(
-            lat,
-            lon,
-            local_row,
-            self.heat_distribution
-        )
+        with stage("evaluate.heatwave"):
+            h_risk = heatwave_risk(
+                lat,
+                lon,
+                local_row,
+                heat_distribution
+            )
 
         # ---- Landslide ----
-        l_risk = landslide_risk(
-            lat,
-            lon,
-            self.landslide
-        )
+        with stage("evaluate.landslide"):
+            l_risk = landslide_risk(
+                lat,
+                lon,
+                self.landslide,
+                landslide_index=self.landslide_index,
+                position=landslide_position
+            )
 
         risk_vector = np.array([
             s_risk,
@@ -130,25 +815,294 @@ class RiskEngine:
             l_risk
         ])
 
-        ranked = rank_materials(self.materials, risk_vector)
+        with stage("evaluate.materials"):
+            top_index, top_score = self.material_ranker.top_k(risk_vector, k=top_k)
+            top_materials = self.material_ranker.frame(top_index, top_score)
 
         # ✅ NEW DESIGN ENGINE CALL
-        design = self.design_engine.generate_design(
-            seismic=s_risk,
-            flood=f_risk,
-            heatwave=h_risk,
-            landslide=l_risk,
-            soil_type=local_row["Soil Type"],
-            elevation=local_row["Elevation_m"],
-            rainfall=local_row["Rainfall_mm"],
-            temperature=local_row["Temperature_C"]
-        )
+        with stage("evaluate.design"):
+            design = self.design_engine.generate_design(
+                seismic=s_risk,
+                flood=f_risk,
+                heatwave=h_risk,
+                landslide=l_risk,
+                soil_type=local_row["Soil Type"],
+                elevation=local_row["Elevation_m"],
+                rainfall=local_row["Rainfall_mm"],
+                temperature=local_row["Temperature_C"]
+            )
 
         return {
             "Seismic_Risk": float(s_risk),
             "Flood_Risk": float(f_risk),
             "Heatwave_Risk": float(h_risk),
             "Landslide_Risk": float(l_risk),
-            "Top_Materials": ranked.head(5),
+            "Top_Materials": top_materials,
             "Design_Recommendations": design   # ✅ NEW
-        }
\ No newline at end of file
+        }
+
+    # ------------------------------------------------------
+
+    def _site_lookup_batch(self, lats, lons, seismic, raster):
+
+        # Nearest compiled row, seismic log-field and nearest landslide row
+        # per site: from the raster where it covers the site, otherwise
+        # from the spatial indexes.
+
+        positions = np.empty(len(lats), dtype=np.intp)
+        seismic_log = np.empty(len(lats))
+        landslide_positions = np.empty(len(lats), dtype=np.intp)
+
+        inside = np.zeros(len(lats), dtype=bool)
+        if raster is not None:
+            inside = raster.contains(lats, lons)
+
+        if inside.any():
+            la, lo = lats[inside], lons[inside]
+            positions[inside] = raster.compiled_position_at(la, lo)
+            seismic_log[inside] = raster.seismic_log_at(la, lo)
+            landslide_positions[inside] = raster.landslide_position_at(la, lo)
+
+        outside = ~inside
+        if outside.any():
+            la, lo = lats[outside], lons[outside]
+            positions[outside] = self.compiled_index.nearest_batch(la, lo)[0][:, 0]
+            seismic_log[outside] = seismic.log_field_batch(la, lo, self.kernel)
+            landslide_positions[outside] = self.landslide_index.nearest_batch(la, lo)[0][:, 0]
+
+        return positions, seismic_log, landslide_positions
+
+    def _zoned_risks_batch(self, lats, lons, positions, local_rows):
+
+        # Flood and heat risks with every site ranked against its own zone
+
+        zones = self.zones[positions]
+
+        f_risk = np.empty(len(lats))
+        h_risk = np.empty(len(lats))
+
+        for zone in np.unique(zones):
+            mask = zones == zone
+            rows = local_rows.iloc[mask]
+
+            f_risk[mask] = flood_risk_batch(
+                lats[mask], lons[mask], rows, self.flood_distribution_by_zone[zone]
+            )
+            h_risk[mask] = heatwave_risk_batch(
+                lats[mask], lons[mask], rows, self.heat_distribution_by_zone[zone]
+            )
+
+        return f_risk, h_risk
+
+    @timed("evaluate_many")
+    def evaluate_many(self, lats, lons, top_k=5):
+
+        # Columnar counterpart of evaluate(): one array entry per site.
+
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+
+        seismic = self.seismic
+        raster = self.raster
+
+        with stage("evaluate_many.site_lookup"):
+            positions, seismic_log, landslide_positions = self._site_lookup_batch(
+                lats, lons, seismic, raster
+            )
+            local_rows = self.compiled.iloc[positions]
+
+        with stage("evaluate_many.hazards"):
+            s_risk = seismic_risk_batch(
+                lats,
+                lons,
+                seismic.catalogue,
+                seismic.distribution,
+                log_field=seismic_log
+            )
+
+            if self.zone_distributions:
+                f_risk, h_risk = self._zoned_risks_batch(lats, lons, positions, local_rows)
+            else:
+                f_risk = flood_risk_batch(lats, lons, local_rows, self.flood_distribution)
+                h_risk = heatwave_risk_batch(lats, lons, local_rows, self.heat_distribution)
+            l_risk = landslide_risk_batch(
+                lats,
+                lons,
+                self.landslide,
+                self.landslide_index,
+                positions=landslide_positions
+            )
+
+        risk_matrix = np.column_stack([
+            s_risk,
+            f_risk,
+            h_risk,
+            np.full(len(lats), 0.5),
+            l_risk
+        ])
+
+        with stage("evaluate_many.materials"):
+            top_index, top_score = self.material_ranker.top_k_batch(
+                risk_matrix, k=top_k
+            )
+
+        with stage("evaluate_many.design"):
+            design = self.design_engine.generate_design_batch(
+                seismic=s_risk,
+                flood=f_risk,
+                heatwave=h_risk,
+                landslide=l_risk,
+                soil_type=local_rows["Soil Type"].values,
+                elevation=local_rows["Elevation_m"].values,
+                rainfall=local_rows["Rainfall_mm"].values,
+                temperature=local_rows["Temperature_C"].values
+            )
+
+        return {
+            "Latitude": lats,
+            "Longitude": lons,
+            "Seismic_Risk": s_risk,
+            "Flood_Risk": f_risk,
+            "Heatwave_Risk": h_risk,
+            "Landslide_Risk": l_risk,
+            "Top_Material_Index": top_index,
+            "Top_Material_Score": top_score,
+            "Primary_Hazard_Driver": design["Primary_Hazard_Driver"],
+            "Hazard_Driven_Design": design["Hazard_Driven_Design"],
+            "Final_Integrated_Design": design["Final_Integrated_Design"],
+            "Design_Strength_Index": design["Design_Strength_Index"],
+        }
+
+    def evaluate_concurrent(self,
+                            lats,
+                            lons,
+                            top_k=5,
+                            workers=None,
+                            chunk_size=2048,
+                            executor=None):
+
+        # evaluate_many() split into chunks that run on a thread pool, with
+        # results identical to a single evaluate_many() call. The batched
+        # path spends most of its time in NumPy and BallTree queries, which
+        # release the GIL, rather than in per-site pandas indexing. Pass
+        # `executor` to share an existing pool instead of creating one;
+        # otherwise `workers` threads are used (default: one per CPU).
+
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+
+        bounds = [
+            (start, min(start + chunk_size, len(lats)))
+            for start in range(0, len(lats), chunk_size)
+        ]
+
+        if len(bounds) <= 1:
+            return self.evaluate_many(lats, lons, top_k=top_k)
+
+        def run(bound):
+            start, stop = bound
+            return self.evaluate_many(lats[start:stop], lons[start:stop], top_k=top_k)
+
+        if executor is not None:
+            parts = list(executor.map(run, bounds))
+        else:
+            with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+                parts = list(pool.map(run, bounds))
+
+        return _concat_results(parts)
+
+    # ------------------------------------------------------
+    # Live Updates
+    # ------------------------------------------------------
+
+    def add_earthquakes(self, df):
+
+        # Adds new events to a running engine. The seismic field is a sum
+        # over events, so only the compiled points within reach of a
+        # new event are updated (with a seismic_error_budget the grid is
+        # rebuilt instead); the distribution is re-sorted and the event
+        # index rebuilt. Readers keep serving from the old state
+        # until the new one is published in a single assignment.
+
+        with self._update_lock, stage("add_earthquakes"):
+
+            current = self.seismic
+
+            # Same columns and dtypes as the held events, so the update
+            # matches a full build; columns the kernel reads are required
+            new = (
+                clean_earthquakes(
+                    df, [*EARTHQUAKE_REQUIRED_COLUMNS, *self.kernel.required_columns]
+                )
+                .reindex(columns=current.earthquake.columns)
+                .astype(current.earthquake.dtypes.to_dict())
+            )
+            if new.empty:
+                return {"events_added": 0, "points_updated": 0}
+
+            start = current.earthquake.index.max() + 1 if len(current.earthquake) else 0
+            new.index = np.arange(start, start + len(new))
+
+            delta = scatter_catalogue_risk(
+                EventCatalogue.from_earthquakes(new),
+                self.compiled_index,
+                kernel=self.kernel
+            )
+
+            earthquake = pd.concat([current.earthquake, new])
+            catalogue = EventCatalogue.from_earthquakes(earthquake)
+            index = SpatialIndex.from_frame(earthquake)
+
+            field, grid, approximation = current.field + delta, None, current.approximation
+
+            # A grid is rebuilt and re-checked at its current resolution
+            # rather than patched, so the field stays one approximation
+            if current.grid is not None:
+                field, grid, approximation = self._compute_seismic_field(
+                    catalogue,
+                    index,
+                    DEFAULT_MAX_CHUNK_BYTES,
+                    grid_settings={
+                        "near_km": current.grid.near_km,
+                        "cell_deg": current.grid.cell_deg,
+                        "band_deg": current.grid.band_deg,
+                    }
+                )
+
+            self.seismic = SeismicState(earthquake, catalogue, index, field, grid, approximation)
+
+            # Published after the state; see evaluate()
+            self.fingerprint = extend_fingerprint(self.fingerprint, new)
+            if self.result_cache is not None:
+                self.result_cache.bind(self.fingerprint)
+
+            # The raster's seismic grid predates the new events
+            if self.raster is not None:
+                self.raster = None
+                warnings.warn(
+                    "Hazard raster disabled: it does not include the added "
+                    "earthquakes. Rebuild it with `python run.py build-raster`."
+                )
+
+            return {
+                "events_added": len(new),
+                "points_updated": int(np.count_nonzero(delta)),
+            }
+
+
+def _concat_results(parts):
+
+    # Joins evaluate_many() results chunk by chunk, including the nested
+    # per-design-part dicts
+
+    merged = {}
+    for name, value in parts[0].items():
+        if isinstance(value, dict):
+            merged[name] = {
+                key: np.concatenate([part[name][key] for part in parts])
+                for key in value
+            }
+        else:
+            merged[name] = np.concatenate([part[name] for part in parts])
+
+    return merged
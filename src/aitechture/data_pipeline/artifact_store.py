@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 6
+
+
+def dataset_fingerprint(data_dir, parameters):
+
+    # Content hash of every CSV under data_dir plus the engine parameters,
+    # so editing any input file or changing a parameter selects a new key.
+
+    digest = hashlib.sha256()
+    digest.update(f"format={FORMAT_VERSION}".encode())
+
+    for path in sorted(Path(data_dir).glob("*.csv")):
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+
+    digest.update(json.dumps(parameters, sort_keys=True, default=str).encode())
+
+    return digest.hexdigest()[:20]
+
+
+def parameter_fingerprint(fingerprint, parameters):
+
+    # Fingerprint of `fingerprint` refined by further parameters (e.g. the
+    # seismic kernel on top of the shared artifacts)
+
+    digest = hashlib.sha256(fingerprint.encode())
+    digest.update(json.dumps(parameters, sort_keys=True, default=str).encode())
+
+    return digest.hexdigest()[:20]
+
+
+def extend_fingerprint(fingerprint, frame):
+
+    # Fingerprint of a state derived from `fingerprint` by adding the rows
+    # of `frame` (e.g. live earthquake updates)
+
+    digest = hashlib.sha256(fingerprint.encode())
+    digest.update(frame.to_csv(index=False).encode())
+
+    return digest.hexdigest()[:20]
+
+
+class ArtifactStore:
+
+    # One directory per fingerprint:
+    #
+    #   <root>/<key>/manifest.json
+    #   <root>/<key>/<name>.npy          arrays (memory-mapped on load)
+    #   <root>/<key>/<frame>/<col>.npy   numeric frame columns
+    #   <root>/<key>/<name>.pkl          fitted models / indexes
+    #
+    # Writes go to a temporary sibling directory that is renamed into place
+    # once complete, so readers never see a half-written store.
+
+    def __init__(self, root, key):
+        self.root = Path(root)
+        self.key = key
+        self.path = self.root / key
+        self._writing = None
+        self._manifest = None
+
+    # --------------------------------------------------
+    # State
+    # --------------------------------------------------
+
+    def exists(self):
+        return (self.path / "manifest.json").exists()
+
+    @property
+    def manifest(self):
+        if self._manifest is None:
+            with open(self.path / "manifest.json") as f:
+                self._manifest = json.load(f)
+        return self._manifest
+
+    def _target(self):
+        return self._writing if self._writing is not None else self.path
+
+    # --------------------------------------------------
+    # Writing
+    # --------------------------------------------------
+
+    def begin(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._writing = self.root / f".{self.key}.{os.getpid()}.tmp"
+        shutil.rmtree(self._writing, ignore_errors=True)
+        self._writing.mkdir()
+        self._manifest = {"format": FORMAT_VERSION, "key": self.key, "frames": {}}
+
+    def commit(self):
+        with open(self._writing / "manifest.json", "w") as f:
+            json.dump(self._manifest, f, indent=2)
+
+        try:
+            os.replace(self._writing, self.path)
+        except OSError:
+            # Another process published the same key first
+            shutil.rmtree(self._writing, ignore_errors=True)
+
+        self._writing = None
+        self._manifest = None
+
+    def abort(self):
+        if self._writing is not None:
+            shutil.rmtree(self._writing, ignore_errors=True)
+        self._writing = None
+        self._manifest = None
+
+    def save_array(self, name, array):
+        np.save(self._target() / f"{name}.npy", np.ascontiguousarray(array))
+
+    def save_object(self, name, obj):
+        with open(self._target() / f"{name}.pkl", "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def save_frame(self, name, df):
+
+        frame_dir = self._target() / name
+        frame_dir.mkdir()
+
+        columns = []
+
+        for i, col in enumerate(df.columns):
+            values = df[col]
+            file_name = f"c{i}.npy"
+
+            if pd.api.types.is_numeric_dtype(values):
+                np.save(frame_dir / file_name, values.to_numpy())
+                columns.append({"name": col, "file": file_name, "kind": "numeric"})
+            else:
+                codes, categories = pd.factorize(values)
+                np.save(frame_dir / file_name, codes.astype(np.int32))
+                columns.append({
+                    "name": col,
+                    "file": file_name,
+                    "kind": "categorical",
+                    "dtype": str(values.dtype),
+                    "categories": [str(c) for c in categories],
+                })
+
+        np.save(frame_dir / "index.npy", df.index.to_numpy())
+
+        self._manifest["frames"][name] = columns
+
+    # --------------------------------------------------
+    # Reading
+    # --------------------------------------------------
+
+    def load_array(self, name, mmap=True):
+        return np.load(
+            self.path / f"{name}.npy",
+            mmap_mode="r" if mmap else None
+        )
+
+    def load_object(self, name):
+        with open(self.path / f"{name}.pkl", "rb") as f:
+            return pickle.load(f)
+
+    def load_frame(self, name):
+
+        frame_dir = self.path / name
+        data = {}
+
+        for col in self.manifest["frames"][name]:
+            values = np.load(frame_dir / col["file"], mmap_mode="r")
+
+            if col["kind"] == "categorical":
+                # .array keeps category columns categorical
+                data[col["name"]] = pd.Series(
+                    pd.Categorical.from_codes(values, col["categories"])
+                ).astype(col["dtype"]).array
+            else:
+                data[col["name"]] = values
+
+        index = np.load(frame_dir / "index.npy")
+
+        # A default 0..n-1 index comes back as a RangeIndex, which takes
+        # no memory per row
+        if np.array_equal(index, np.arange(len(index))):
+            index = pd.RangeIndex(len(index))
+
+        return pd.DataFrame(data, index=index)
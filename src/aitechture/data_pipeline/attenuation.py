@@ -0,0 +1,162 @@
+import numpy as np
+
+
+# ----------------------------
+# Attenuation Kernels
+# ----------------------------
+
+class AttenuationKernel:
+
+    # How an event's value decays with distance. attenuate() maps an array
+    # of distances (km) to weights of the same shape; the kernel is zero
+    # beyond support_km, which is also the radius spatial index queries
+    # are pruned to. Kernels whose reach differs per event return it from
+    # event_radius(); the others reach support_km for every event.
+
+    name = None
+
+    # Event columns the kernel reads, beyond those of the seismic model
+    required_columns = []
+
+    def __init__(self, scale_km=50.0, radius_km=300.0):
+        self.scale_km = float(scale_km)
+        self.radius_km = float(radius_km)
+
+    @property
+    def support_km(self):
+        return self.radius_km
+
+    @property
+    def per_event(self):
+        return False
+
+    def attenuate(self, distances):
+        raise NotImplementedError
+
+    def event_radius(self, catalogue, positions=slice(None)):
+        return None
+
+    def contributions(self, distances, catalogue, positions=slice(None)):
+
+        # Attenuated values of catalogue events `positions` at `distances`
+        # (broadcast against each other). Distances must already be within
+        # support_km.
+
+        weights = catalogue.values[positions] * self.attenuate(distances)
+
+        if self.per_event:
+            weights = np.where(
+                distances <= self.event_radius(catalogue, positions), weights, 0.0
+            )
+
+        return weights
+
+    def params(self):
+        return {"scale_km": self.scale_km, "radius_km": self.radius_km}
+
+    def spec(self):
+        # Identifies the kernel in fingerprints and reports
+        return {"name": self.name, **self.params()}
+
+    def __repr__(self):
+        params = ", ".join(f"{key}={value}" for key, value in self.params().items())
+        return f"{type(self).__name__}({params})"
+
+
+class CauchyKernel(AttenuationKernel):
+
+    # 1 / (1 + (d / scale)^2): the engine's original attenuation
+
+    name = "cauchy"
+
+    def attenuate(self, distances):
+        return 1 / (1 + (distances / self.scale_km) ** 2)
+
+
+class GaussianKernel(AttenuationKernel):
+
+    name = "gaussian"
+
+    def attenuate(self, distances):
+        return np.exp(-0.5 * (distances / self.scale_km) ** 2)
+
+
+class ExponentialKernel(AttenuationKernel):
+
+    name = "exponential"
+
+    def attenuate(self, distances):
+        return np.exp(-distances / self.scale_km)
+
+
+class MagnitudeRadiusKernel(CauchyKernel):
+
+    # Cauchy attenuation with a cutoff that grows with magnitude:
+    # km_per_magnitude * M, clipped to [min_radius_km, radius_km]. Index
+    # queries use radius_km; nearer cutoffs are applied per event. Needs
+    # a catalogue with magnitudes.
+
+    name = "magnitude"
+    required_columns = ["Magnitude"]
+
+    def __init__(self,
+                 scale_km=50.0,
+                 radius_km=300.0,
+                 km_per_magnitude=60.0,
+                 min_radius_km=50.0):
+
+        super().__init__(scale_km, radius_km)
+        self.km_per_magnitude = float(km_per_magnitude)
+        self.min_radius_km = float(min_radius_km)
+
+    @property
+    def per_event(self):
+        return True
+
+    def event_radius(self, catalogue, positions=slice(None)):
+
+        if catalogue.magnitudes is None:
+            raise ValueError("The magnitude kernel needs event magnitudes")
+
+        return np.clip(
+            self.km_per_magnitude * catalogue.magnitudes[positions],
+            self.min_radius_km,
+            self.radius_km
+        )
+
+    def params(self):
+        return {
+            **super().params(),
+            "km_per_magnitude": self.km_per_magnitude,
+            "min_radius_km": self.min_radius_km,
+        }
+
+
+# ----------------------------
+# Registry
+# ----------------------------
+
+KERNELS = {
+    kernel.name: kernel
+    for kernel in [CauchyKernel, GaussianKernel, ExponentialKernel, MagnitudeRadiusKernel]
+}
+
+
+def make_kernel(name="cauchy", **params):
+    try:
+        kernel = KERNELS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown attenuation kernel {name!r}; choose from {sorted(KERNELS)}"
+        ) from None
+    return kernel(**params)
+
+
+def resolve_kernel(kernel=None, radius_km=300):
+
+    # A kernel instance is used as is; a registry name, or None for the
+    # default Cauchy kernel, is built with radius_km as its cutoff
+
+    if isinstance(kernel, AttenuationKernel):
+        return kernel
+    return make_kernel(kernel or "cauchy", radius_km=radius_km)
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BUNDLE_VERSION = 1
+
+# Bundles live next to the CSVs: data/columnar/<csv stem>/
+BUNDLE_DIRNAME = "columnar"
+
+# Text columns with at most this share of distinct values are stored as
+# integer codes plus a category list; others as fixed-width strings.
+MAX_CATEGORY_RATIO = 0.5
+
+
+def _source_digest(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _source_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _code_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def bundle_path(csv_path):
+    csv_path = Path(csv_path)
+    return csv_path.parent / BUNDLE_DIRNAME / csv_path.stem
+
+
+# ----------------------------
+# Writing
+# ----------------------------
+
+def write_bundle(df, csv_path):
+
+    # Typed columnar copy of a cleaned frame:
+    #
+    #   bundle.json   version, source hash, row count, column layout
+    #   c<i>.npy      one array per column
+    #   index.npy     the frame's index when rows were dropped while
+    #                 cleaning; a RangeIndex is kept in bundle.json
+    #
+    # Written to a temporary sibling and renamed into place.
+
+    target = bundle_path(csv_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    staging = target.parent / f".{target.name}.{os.getpid()}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+
+    columns = []
+
+    for i, col in enumerate(df.columns):
+        values = df[col]
+        entry = {"name": col, "file": f"c{i}.npy", "dtype": str(values.dtype)}
+
+        if pd.api.types.is_numeric_dtype(values):
+            array = values.to_numpy()
+            entry["kind"] = "numeric"
+        else:
+            codes, categories = pd.factorize(values)
+
+            if len(categories) <= MAX_CATEGORY_RATIO * max(len(values), 1):
+                array = codes.astype(_code_dtype(len(categories)))
+                entry["kind"] = "categorical"
+                entry["categories"] = [str(c) for c in categories]
+            else:
+                array = values.to_numpy(dtype=str)
+                entry["kind"] = "string"
+
+        np.save(staging / entry["file"], np.ascontiguousarray(array))
+        columns.append(entry)
+
+    if isinstance(df.index, pd.RangeIndex):
+        index = {"start": df.index.start, "stop": df.index.stop, "step": df.index.step}
+    else:
+        np.save(staging / "index.npy", df.index.to_numpy())
+        index = "index.npy"
+
+    with open(staging / "bundle.json", "w") as f:
+        json.dump({
+            "version": BUNDLE_VERSION,
+            "source": Path(csv_path).name,
+            "source_sha256": _source_digest(csv_path),
+            "source_stamp": _source_stamp(csv_path),
+            "rows": len(df),
+            "index": index,
+            "columns": columns,
+        }, f, indent=2)
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+
+    return target
+
+
+# ----------------------------
+# Reading
+# ----------------------------
+
+def find_bundle(csv_path):
+
+    # The bundle for csv_path if one exists and was converted from the
+    # current file contents, else None. A bundle without its CSV is used
+    # as-is.
+
+    target = bundle_path(csv_path)
+
+    try:
+        with open(target / "bundle.json") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get("version") != BUNDLE_VERSION:
+        return None
+
+    if not Path(csv_path).exists():
+        return target
+
+    # Unchanged size and mtime skip hashing; a touched but identical file
+    # (e.g. after a checkout) still matches on content.
+    if meta["source_stamp"] != _source_stamp(csv_path):
+        if meta["source_sha256"] != _source_digest(csv_path):
+            return None
+
+    return target
+
+
+def read_bundle(path, columns=None):
+
+    # Only the requested columns are read from disk, in the order given
+
+    path = Path(path)
+
+    with open(path / "bundle.json") as f:
+        meta = json.load(f)
+
+    layout = {col["name"]: col for col in meta["columns"]}
+
+    names = list(layout) if columns is None else list(columns)
+
+    missing = [name for name in names if name not in layout]
+    if missing:
+        raise KeyError(f"Columns not in bundle {path.name}: {missing}")
+
+    # float64 columns are read straight into one (columns x rows) block,
+    # which becomes the frame's storage without a consolidation copy
+    floats = [name for name in names if layout[name]["dtype"] == "float64"]
+
+    block = np.empty((len(floats), meta["rows"]))
+    for row, name in enumerate(floats):
+        block[row] = np.load(path / layout[name]["file"], mmap_mode="r")
+
+    if isinstance(meta["index"], dict):
+        index = pd.RangeIndex(**meta["index"])
+    else:
+        index = np.load(path / meta["index"])
+
+    df = pd.DataFrame(block.T, index=index, columns=floats, copy=False)
+
+    for loc, name in enumerate(names):
+        if name in floats:
+            continue
+
+        col = layout[name]
+        values = np.load(path / col["file"])
+
+        if col["kind"] == "categorical":
+            values = pd.Categorical.from_codes(values, col["categories"])
+
+        df.insert(loc, name, pd.Series(values, index=index, copy=False).astype(col["dtype"]))
+
+    return df
+
+
+def iter_bundle_chunks(path, columns, chunk_rows):
+
+    # Numeric columns in row slices of at most chunk_rows, read from
+    # memory-mapped files: only one slice is resident at a time.
+
+    path = Path(path)
+
+    with open(path / "bundle.json") as f:
+        meta = json.load(f)
+
+    layout = {col["name"]: col for col in meta["columns"]}
+
+    missing = [name for name in columns if name not in layout]
+    if missing:
+        raise KeyError(f"Columns not in bundle {path.name}: {missing}")
+
+    arrays = {name: np.load(path / layout[name]["file"], mmap_mode="r") for name in columns}
+
+    for start in range(0, meta["rows"], chunk_rows):
+        stop = min(start + chunk_rows, meta["rows"])
+        yield pd.DataFrame({name: np.array(arrays[name][start:stop]) for name in columns})
@@ -1,6 +1,13 @@
 import pandas as pd
 from pathlib import Path
 
+from aitechture.data_pipeline.columnar import (
+    find_bundle,
+    iter_bundle_chunks,
+    read_bundle,
+    write_bundle,
+)
+
 BASE_DIR = Path(__file__).resolve().parents[3]
 DATA_DIR = BASE_DIR / "data"
 
@@ -11,7 +18,25 @@ def _load_csv(path):
     return df
 
 
-def load_compiled(path=DATA_DIR / "compiled_clean.csv"):
+def _load_columnar(path, columns, prefer_columnar):
+    # Cleaned columnar copy written by convert_datasets(), if current
+    if not prefer_columnar:
+        return None
+    bundle = find_bundle(path)
+    if bundle is None:
+        return None
+    return read_bundle(bundle, columns)
+
+
+def _project(df, columns):
+    return df if columns is None else df[list(columns)]
+
+
+def load_compiled(path=DATA_DIR / "compiled_clean.csv", columns=None, prefer_columnar=True):
+    df = _load_columnar(path, columns, prefer_columnar)
+    if df is not None:
+        return df
+
     df = _load_csv(path)
 
     numeric_cols = [
@@ -34,29 +59,61 @@ def load_compiled(path=DATA_DIR / "compiled_clean.csv"):
             df[col] = pd.to_numeric(df[col], errors="coerce")
 
     df = df.dropna()
-    return df
+    return _project(df, columns)
 
 
-def load_earthquake(path=DATA_DIR / "earthquake_clean.csv"):
-    df = _load_csv(path)
+EARTHQUAKE_NUMERIC_COLUMNS = [
+    "Latitude",
+    "Longitude",
+    "Depth",
+    "Magnitude",
+    "Energy_Index",
+    "Depth_Factor",
+]
 
-    numeric_cols = [
-        "Latitude",
-        "Longitude",
-        "Depth",
-        "Magnitude",
-        "Energy_Index",
-        "Depth_Factor",
-    ]
+# Read by the seismic model
+EARTHQUAKE_REQUIRED_COLUMNS = ["Latitude", "Longitude", "Energy_Index", "Depth_Factor"]
 
-    for col in numeric_cols:
+
+def load_earthquake(path=DATA_DIR / "earthquake_clean.csv", columns=None, prefer_columnar=True):
+    df = _load_columnar(path, columns, prefer_columnar)
+    if df is not None:
+        return df
+
+    df = _load_csv(path)
+
+    for col in EARTHQUAKE_NUMERIC_COLUMNS:
         df[col] = pd.to_numeric(df[col], errors="coerce")
 
     df = df.dropna()
-    return df
+    return _project(df, columns)
+
+
+def clean_earthquakes(df, required_columns=EARTHQUAKE_REQUIRED_COLUMNS):
+
+    # Same coercion as load_earthquake() for frames arriving from a feed.
+    # Only the columns the seismic model (and its attenuation kernel) reads
+    # must be present and valid; rows missing any of them are dropped.
+
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+
+    missing = [col for col in required_columns if col not in df.columns]
+    if missing:
+        raise ValueError(f"Earthquake frame is missing columns: {missing}")
+
+    for col in EARTHQUAKE_NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    return df.dropna(subset=required_columns)
+
 
+def load_landslide(path=DATA_DIR / "landslide_clean.csv", columns=None, prefer_columnar=True):
+    df = _load_columnar(path, columns, prefer_columnar)
+    if df is not None:
+        return df
 
-def load_landslide(path=DATA_DIR / "landslide_clean.csv"):
     df = _load_csv(path)
 
     numeric_cols = [
@@ -75,12 +132,42 @@ def load_landslide(path=DATA_DIR / "landslide_clean.csv"):
         df[col] = pd.to_numeric(df[col], errors="coerce")
 
     df = df.dropna()
-    return df
+    return _project(df, columns)
+
 
+def load_materials(path=DATA_DIR / "materials_clean.csv", columns=None, prefer_columnar=True):
+    df = _load_columnar(path, columns, prefer_columnar)
+    if df is not None:
+        return df
 
-def load_materials(path=DATA_DIR / "materials_clean.csv"):
     df = _load_csv(path)
-    return df
+    return _project(df, columns)
+
+
+def iter_chunks(path, columns, chunk_rows=1_000_000, prefer_columnar=True):
+
+    # Numeric `columns` of a dataset too large to load at once, as frames
+    # of at most chunk_rows rows. Uses the columnar bundle when current;
+    # otherwise reads the CSV in chunks, dropping rows where any of the
+    # columns is missing or not numeric.
+
+    columns = list(columns)
+
+    if prefer_columnar:
+        bundle = find_bundle(path)
+        if bundle is not None:
+            yield from iter_bundle_chunks(bundle, columns, chunk_rows)
+            return
+
+    wanted = set(columns)
+    reader = pd.read_csv(path, usecols=lambda col: col.strip() in wanted, chunksize=chunk_rows)
+
+    for chunk in reader:
+        chunk.columns = chunk.columns.str.strip()
+        chunk = chunk[columns].apply(pd.to_numeric, errors="coerce").dropna()
+
+        if len(chunk):
+            yield chunk
 
 
 def load_climate_rules(path=DATA_DIR / "climate_rules_advanced.csv"):
@@ -92,4 +179,31 @@ def load_hazard_rules(path=DATA_DIR / "hazard_rules_advanced.csv"):
 
 
 def load_soil_rules(path=DATA_DIR / "soil_rules_advanced.csv"):
-    return _load_csv(path)
\ No newline at end of file
+    return _load_csv(path)
+
+
+# ----------------------------
+# Columnar Conversion
+# ----------------------------
+
+DATASETS = {
+    "compiled_clean.csv": load_compiled,
+    "earthquake_clean.csv": load_earthquake,
+    "landslide_clean.csv": load_landslide,
+    "materials_clean.csv": load_materials,
+}
+
+
+def convert_datasets(data_dir=DATA_DIR):
+
+    # One-shot conversion of the cleaned datasets to columnar bundles under
+    # data/columnar/. The loaders read a bundle instead of its CSV for as
+    # long as the CSV is unchanged.
+
+    converted = {}
+
+    for name, loader in DATASETS.items():
+        path = Path(data_dir) / name
+        converted[name] = write_bundle(loader(path, prefer_columnar=False), path)
+
+    return converted
@@ -0,0 +1,183 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from aitechture.data_pipeline.attenuation import resolve_kernel
+from aitechture.data_pipeline.spatial_aggregation import (
+    DEFAULT_MAX_CHUNK_BYTES,
+    EventCatalogue,
+    aggregate_catalogue_risk_batch,
+)
+from aitechture.data_pipeline.spatial_index import SpatialIndex
+
+# Query points handed to a worker per task
+DEFAULT_TASK_SIZE = 4096
+
+
+# ----------------------------
+# Shared Memory
+# ----------------------------
+
+class SharedArrays:
+
+    # Copies NumPy arrays into named shared-memory blocks. `spec` is a
+    # small picklable description that workers pass to attach_arrays()
+    # to map the same memory without copying it.
+
+    def __init__(self, arrays):
+        self._blocks = []
+        self.spec = {}
+        self.arrays = {}
+
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+            view[...] = array
+
+            self._blocks.append(block)
+            self.spec[name] = (block.name, array.shape, array.dtype.str)
+            self.arrays[name] = view
+
+    def close(self):
+        self.arrays = {}
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_arrays(spec):
+
+    blocks = []
+    arrays = {}
+
+    for name, (block_name, shape, dtype) in spec.items():
+        # Pool workers share the creator's resource tracker, which keeps
+        # one registration per block; SharedArrays.close() unlinks it.
+        block = shared_memory.SharedMemory(name=block_name)
+        blocks.append(block)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+
+    return blocks, arrays
+
+
+# ----------------------------
+# Seismic Field Workers
+# ----------------------------
+
+_worker = {}
+
+
+def _init_seismic_worker(spec, kernel, use_index, max_chunk_bytes):
+
+    blocks, arrays = attach_arrays(spec)
+
+    catalogue = EventCatalogue(
+        arrays["event_lat"],
+        arrays["event_lon"],
+        arrays["event_value"],
+        arrays.get("event_magnitude")
+    )
+
+    _worker.update({
+        "blocks": blocks,
+        "arrays": arrays,
+        "catalogue": catalogue,
+        "index": SpatialIndex(catalogue.lat, catalogue.lon) if use_index else None,
+        "kernel": kernel,
+        "max_chunk_bytes": max_chunk_bytes,
+    })
+
+
+def _seismic_task(start, stop):
+
+    arrays = _worker["arrays"]
+
+    # Each task owns a disjoint slice of the output, so the merge does not
+    # depend on scheduling order.
+    arrays["out"][start:stop] = aggregate_catalogue_risk_batch(
+        arrays["query_lat"][start:stop],
+        arrays["query_lon"][start:stop],
+        _worker["catalogue"],
+        max_chunk_bytes=_worker["max_chunk_bytes"],
+        index=_worker["index"],
+        kernel=_worker["kernel"]
+    )
+
+    return start, stop
+
+
+def build_seismic_field_parallel(lats,
+                                 lons,
+                                 catalogue,
+                                 radius_km=300,
+                                 workers=None,
+                                 use_index=True,
+                                 task_size=DEFAULT_TASK_SIZE,
+                                 max_chunk_bytes=DEFAULT_MAX_CHUNK_BYTES,
+                                 kernel=None):
+
+    # Parallel counterpart of build_seismic_field: query points are split
+    # into contiguous tasks across a process pool. Events, queries and the
+    # output live in shared memory; nothing but slice bounds is pickled.
+    # Per-point sums do not depend on how points are grouped, so the
+    # result equals the serial path for any worker count.
+
+    kernel = resolve_kernel(kernel, radius_km)
+
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+
+    # No more processes than tasks
+    n_tasks = -(-len(lats) // task_size)
+    workers = max(1, min(workers or os.cpu_count() or 1, n_tasks))
+
+    if workers == 1:
+        return aggregate_catalogue_risk_batch(
+            lats,
+            lons,
+            catalogue,
+            max_chunk_bytes=max_chunk_bytes,
+            index=SpatialIndex(catalogue.lat, catalogue.lon) if use_index else None,
+            kernel=kernel
+        )
+
+    arrays = {
+        "event_lat": catalogue.lat,
+        "event_lon": catalogue.lon,
+        "event_value": catalogue.values,
+        "query_lat": lats,
+        "query_lon": lons,
+        "out": np.zeros(len(lats)),
+    }
+    if catalogue.magnitudes is not None:
+        arrays["event_magnitude"] = catalogue.magnitudes
+
+    shared = SharedArrays(arrays)
+
+    try:
+        tasks = [
+            (start, min(start + task_size, len(lats)))
+            for start in range(0, len(lats), task_size)
+        ]
+
+        with ProcessPoolExecutor(
+            workers,
+            initializer=_init_seismic_worker,
+            initargs=(shared.spec, kernel, use_index, max_chunk_bytes)
+        ) as pool:
+            list(pool.map(_seismic_task, *zip(*tasks)))
+
+        return shared.arrays["out"].copy()
+    finally:
+        shared.close()
@@ -2,15 +2,72 @@ import numpy as np
 import pandas as pd
 
 
+CLIMATE_ZONING_FEATURES = [
+    "Rainfall_mm",
+    "Temperature_C",
+    "Humidity_pct",
+    "Elevation_m",
+]
+
+
+# Columns the engine keeps per dataset: the ones some model reads. The
+# materials frame is kept whole, since evaluate() returns its rows.
+ENGINE_COLUMNS = {
+    "compiled": [
+        "Latitude",
+        "Longitude",
+        "Rainfall_mm",
+        "Temperature_C",
+        "Humidity_pct",
+        "River_Discharge",
+        "Water_Level",
+        "Elevation_m",
+        "Soil Type",
+    ],
+    "earthquake": [
+        "Latitude",
+        "Longitude",
+        "Magnitude",
+        "Energy_Index",
+        "Depth_Factor",
+    ],
+    "landslide": [
+        "Latitude",
+        "Longitude",
+        "Base_Landslide_Risk",
+    ],
+}
+
+# Text columns held as pandas categoricals (small integer codes)
+CATEGORICAL_COLUMNS = ["Soil Type"]
+
+# Narrowed by compact_frame(float32=True). Features stay float64: they
+# are ranked against percentile distributions and compared with
+# thresholds, where float32 rounding can break ties and move a score by
+# a whole block of tied ranks.
+FLOAT32_COLUMNS = ["Latitude", "Longitude"]
+
+
+def compact_frame(df, float32=False):
+
+    # Categorical text columns become integer codes; with float32,
+    # coordinates are narrowed too. The engine builds its spatial indexes
+    # from float64 coordinates first, so nearest rows do not change.
+
+    df = df.copy()
+
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype("category")
+        elif float32 and col in FLOAT32_COLUMNS:
+            df[col] = df[col].astype(np.float32)
+
+    return df
+
+
 def build_climate_zoning_features(df):
-    return df[
-        [
-            "Rainfall_mm",
-            "Temperature_C",
-            "Humidity_pct",
-            "Elevation_m",
-        ]
-    ].copy()
+    # float64 even from a float32 frame, so zones do not depend on it
+    return df[CLIMATE_ZONING_FEATURES].astype(float)
 
 
 def build_flood_features(df):
@@ -35,8 +92,16 @@ def build_heatwave_features(df):
     ].copy()
 
 
-def percentile(value, distribution):
-    return np.sum(distribution <= value) / len(distribution)
+def percentile(value, sorted_distribution):
+
+    # Fraction of the distribution <= value, by binary search. The
+    # distribution must be sorted ascending; value may be a scalar or an
+    # array of raw scores, which are all ranked in one call.
+
+    ranks = np.searchsorted(sorted_distribution, value, side="right")
+    ranks = np.where(np.isnan(value), 0, ranks)
+
+    return ranks / len(sorted_distribution)
 
 
 def minmax_scale(series):
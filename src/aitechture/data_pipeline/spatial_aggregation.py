@@ -1,8 +1,19 @@
 import numpy as np
 
+from aitechture.data_pipeline.attenuation import resolve_kernel
+
+EARTH_RADIUS_KM = 6371.0
+
+# Upper bound on the (queries x events) working set of one broadcast chunk.
+DEFAULT_MAX_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Number of float64 (queries x events) temporaries alive at once while a
+# chunk is evaluated (distances, attenuation, mask, products).
+_CHUNK_TEMPORARIES = 4
+
 
 def haversine_distance(lat1, lon1, lat2, lon2):
-    R = 6371.0
+    R = EARTH_RADIUS_KM
 
     lat1 = np.radians(lat1)
     lon1 = np.radians(lon1)
@@ -21,22 +32,260 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     return R * c
 
 
-def aggregate_spatial_risk(lat, lon, df, value_column, radius_km=300):
+# ----------------------------
+# Event Catalogue
+# ----------------------------
+
+class EventCatalogue:
+
+    # Point events as contiguous float arrays: coordinates in degrees and
+    # radians, the precomputed cos(latitude) used by haversine, and the
+    # per-event value that is attenuated with distance. Magnitudes are
+    # optional and only read by magnitude-dependent kernels.
+
+    def __init__(self, lats, lons, values, magnitudes=None):
+        self.lat = np.ascontiguousarray(lats, dtype=float)
+        self.lon = np.ascontiguousarray(lons, dtype=float)
+        self.values = np.ascontiguousarray(values, dtype=float)
+        self.magnitudes = (
+            None if magnitudes is None else np.ascontiguousarray(magnitudes, dtype=float)
+        )
+
+        self.lat_rad = np.radians(self.lat)
+        self.lon_rad = np.radians(self.lon)
+        self.cos_lat = np.cos(self.lat_rad)
+
+    def __len__(self):
+        return len(self.values)
+
+    def arrays(self):
+        # Every array the catalogue holds
+        arrays = [self.lat, self.lon, self.values, self.lat_rad, self.lon_rad, self.cos_lat]
+        if self.magnitudes is not None:
+            arrays.append(self.magnitudes)
+        return arrays
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.arrays())
+
+    @classmethod
+    def from_frame(cls, df, value_column):
+        return cls(
+            df["Latitude"].values,
+            df["Longitude"].values,
+            df[value_column].values
+        )
+
+    @classmethod
+    def from_earthquakes(cls, earthquake_df):
+        return cls(
+            earthquake_df["Latitude"].values,
+            earthquake_df["Longitude"].values,
+            earthquake_df["Energy_Index"].values
+            * earthquake_df["Depth_Factor"].values,
+            earthquake_df["Magnitude"].values if "Magnitude" in earthquake_df else None
+        )
+
+    def distances_from(self, lat, lon):
+
+        # Same arithmetic as haversine_distance(lat, lon, self.lat, self.lon),
+        # with the event-side radians and cosines reused.
+
+        lat = np.radians(lat)
+        lon = np.radians(lon)
 
-    lat_array = df["Latitude"].values
-    lon_array = df["Longitude"].values
-    values = df[value_column].values
+        dlat = self.lat_rad - lat
+        dlon = self.lon_rad - lon
 
-    distances = haversine_distance(lat, lon, lat_array, lon_array)
+        a = (
+            np.sin(dlat / 2) ** 2
+            + np.cos(lat) * self.cos_lat * np.sin(dlon / 2) ** 2
+        )
 
-    mask = distances <= radius_km
+        c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        return EARTH_RADIUS_KM * c
 
-    filtered_distances = distances[mask]
-    filtered_values = values[mask]
 
-    if len(filtered_values) == 0:
+# ----------------------------
+# Aggregation
+# ----------------------------
+
+# Every aggregation takes an AttenuationKernel (see attenuation.py) or a
+# registry name as `kernel`. The default, None, is the Cauchy kernel with
+# radius_km as its cutoff; a kernel instance brings its own cutoff and
+# radius_km is ignored.
+
+def aggregate_catalogue_risk(lat, lon, catalogue, radius_km=300, index=None, kernel=None):
+
+    kernel = resolve_kernel(kernel, radius_km)
+
+    if index is not None:
+        # Only the events inside the kernel's support are touched
+        positions, filtered_distances = index.query_radius(lat, lon, kernel.support_km)
+    else:
+        distances = catalogue.distances_from(lat, lon)
+
+        positions = np.flatnonzero(distances <= kernel.support_km)
+        filtered_distances = distances[positions]
+
+    if len(positions) == 0:
         return 0.0
 
-    attenuation = 1 / (1 + (filtered_distances / 50) ** 2)
+    return np.sum(kernel.contributions(filtered_distances, catalogue, positions))
+
+
+def _chunk_rows(n_events, max_chunk_bytes):
+    row_bytes = max(n_events, 1) * 8 * _CHUNK_TEMPORARIES
+    return max(1, int(max_chunk_bytes // row_bytes))
+
+
+def aggregate_catalogue_risk_batch(lats,
+                                   lons,
+                                   catalogue,
+                                   radius_km=300,
+                                   max_chunk_bytes=DEFAULT_MAX_CHUNK_BYTES,
+                                   index=None,
+                                   kernel=None):
+
+    kernel = resolve_kernel(kernel, radius_km)
+
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+
+    result = np.zeros(len(lats))
+
+    if len(catalogue) == 0:
+        return result
+
+    step = _chunk_rows(len(catalogue), max_chunk_bytes)
 
-    return np.sum(filtered_values * attenuation)
\ No newline at end of file
+    for start in range(0, len(lats), step):
+        stop = min(start + step, len(lats))
+
+        if index is not None:
+            # Only (query, event) pairs inside the radius are materialised
+            query_ids, positions, distances = index.query_radius_batch(
+                lats[start:stop], lons[start:stop], kernel.support_km
+            )
+
+            result[start:stop] = np.bincount(
+                query_ids,
+                weights=kernel.contributions(distances, catalogue, positions),
+                minlength=stop - start
+            )
+            continue
+
+        distances = catalogue.distances_from(
+            lats[start:stop, None],
+            lons[start:stop, None]
+        )
+
+        contribution = np.where(
+            distances <= kernel.support_km,
+            kernel.contributions(distances, catalogue),
+            0.0
+        )
+
+        result[start:stop] = contribution.sum(axis=1)
+
+    return result
+
+
+def scatter_catalogue_risk(catalogue,
+                           target_index,
+                           radius_km=300,
+                           max_pairs=1_000_000,
+                           kernel=None):
+
+    # Transpose of aggregate_catalogue_risk_batch: the summed attenuated
+    # contribution of every catalogue event to each point of target_index
+    # (a SpatialIndex over the targets). Only targets within radius_km of
+    # some event are touched, so the cost scales with the events given,
+    # not with the number of targets.
+
+    kernel = resolve_kernel(kernel, radius_km)
+
+    result = np.zeros(target_index.size)
+
+    if len(catalogue) == 0:
+        return result
+
+    # Events per query, resized after each query so that about max_pairs
+    # (event, target) pairs are alive at once
+    step = 1024
+    start = 0
+
+    while start < len(catalogue):
+        stop = min(start + step, len(catalogue))
+
+        event_ids, positions, distances = target_index.query_radius_batch(
+            catalogue.lat[start:stop], catalogue.lon[start:stop], kernel.support_km
+        )
+
+        result += np.bincount(
+            positions,
+            weights=kernel.contributions(distances, catalogue, start + event_ids),
+            minlength=target_index.size
+        )
+
+        per_event = max(len(positions) / (stop - start), 1)
+        step = max(1, int(max_pairs // per_event))
+        start = stop
+
+    return result
+
+
+def aggregate_spatial_risk(lat, lon, df, value_column, radius_km=300, index=None, kernel=None):
+    return aggregate_catalogue_risk(
+        lat,
+        lon,
+        EventCatalogue.from_frame(df, value_column),
+        radius_km=radius_km,
+        index=index,
+        kernel=kernel
+    )
+
+
+def aggregate_spatial_risk_batch(lats,
+                                 lons,
+                                 df,
+                                 value_column,
+                                 radius_km=300,
+                                 max_chunk_bytes=DEFAULT_MAX_CHUNK_BYTES,
+                                 index=None,
+                                 kernel=None):
+    return aggregate_catalogue_risk_batch(
+        lats,
+        lons,
+        EventCatalogue.from_frame(df, value_column),
+        radius_km=radius_km,
+        max_chunk_bytes=max_chunk_bytes,
+        index=index,
+        kernel=kernel
+    )
+
+
+def build_seismic_field(lats,
+                        lons,
+                        earthquakes,
+                        radius_km=300,
+                        max_chunk_bytes=DEFAULT_MAX_CHUNK_BYTES,
+                        index=None,
+                        kernel=None):
+
+    # earthquakes is an EventCatalogue of Energy_Index * Depth_Factor
+    # contributions, or the raw earthquake frame.
+
+    if not isinstance(earthquakes, EventCatalogue):
+        earthquakes = EventCatalogue.from_earthquakes(earthquakes)
+
+    return aggregate_catalogue_risk_batch(
+        lats,
+        lons,
+        earthquakes,
+        radius_km=radius_km,
+        max_chunk_bytes=max_chunk_bytes,
+        index=index,
+        kernel=kernel
+    )
@@ -0,0 +1,97 @@
+import numpy as np
+
+from aitechture.data_pipeline.spatial_aggregation import EARTH_RADIUS_KM
+
+
+class SpatialIndex:
+
+    # BallTree over (lat, lon) in radians with the haversine metric, so
+    # every distance it returns is a great-circle distance on the sphere.
+    # Returned positions are row positions (iloc) in the indexed frame.
+
+    def __init__(self, lats, lons, leaf_size=40):
+        # Imported here: scikit-learn takes longer to import than the rest
+        # of the package together, and is only needed once an index exists
+        from sklearn.neighbors import BallTree
+
+        coords = np.radians(
+            np.column_stack([
+                np.asarray(lats, dtype=float),
+                np.asarray(lons, dtype=float),
+            ])
+        )
+        self.size = len(coords)
+        self.tree = BallTree(coords, leaf_size=leaf_size, metric="haversine")
+
+    @classmethod
+    def from_frame(cls, df, leaf_size=40):
+        return cls(df["Latitude"].values, df["Longitude"].values, leaf_size)
+
+    @property
+    def nbytes(self):
+        # Coordinates, permutation and node arrays held by the tree
+        return sum(array.nbytes for array in self.tree.get_arrays())
+
+    def coordinates(self):
+        # Indexed (lat, lon) in degrees, recovered from the tree's float64
+        # radians; the indexed frame may hold them rounded to float32
+        lats, lons = np.degrees(self.tree.get_arrays()[0]).T
+        return lats, lons
+
+    def _query_point(self, lat, lon):
+        return np.radians([[float(lat), float(lon)]])
+
+    def query_radius(self, lat, lon, km):
+        positions, distances = self.tree.query_radius(
+            self._query_point(lat, lon),
+            r=km / EARTH_RADIUS_KM,
+            return_distance=True
+        )
+        return positions[0], distances[0] * EARTH_RADIUS_KM
+
+    def nearest(self, lat, lon, k=1):
+        distances, positions = self.tree.query(
+            self._query_point(lat, lon), k=min(k, self.size)
+        )
+        return positions[0], distances[0] * EARTH_RADIUS_KM
+
+    # --------------------------------------------------
+    # Batch Queries
+    # --------------------------------------------------
+
+    def _query_points(self, lats, lons):
+        return np.radians(
+            np.column_stack([
+                np.asarray(lats, dtype=float),
+                np.asarray(lons, dtype=float),
+            ])
+        )
+
+    def query_radius_batch(self, lats, lons, km):
+
+        # Flattened neighbourhoods: query_ids[i] is the query that
+        # positions[i] / distances[i] belong to.
+
+        positions, distances = self.tree.query_radius(
+            self._query_points(lats, lons),
+            r=km / EARTH_RADIUS_KM,
+            return_distance=True
+        )
+
+        counts = np.array([len(p) for p in positions], dtype=np.intp)
+        query_ids = np.repeat(np.arange(len(positions)), counts)
+
+        if counts.sum() == 0:
+            return query_ids, np.zeros(0, dtype=np.intp), np.zeros(0)
+
+        return (
+            query_ids,
+            np.concatenate(positions),
+            np.concatenate(distances) * EARTH_RADIUS_KM
+        )
+
+    def nearest_batch(self, lats, lons, k=1):
+        distances, positions = self.tree.query(
+            self._query_points(lats, lons), k=min(k, self.size)
+        )
+        return positions, distances * EARTH_RADIUS_KM